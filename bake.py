@@ -0,0 +1,46 @@
+"""Pre-scale and convert every image into the memory-mapped sprite cache.
+
+Run after changing images; stale entries are ignored at runtime anyway.
+
+Usage:
+    python bake.py
+"""
+
+import os
+import sys
+from os.path import join, splitext
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+sys.path.append("./src")
+
+from gamelib.mgmt.assets import ImageSpec
+from gamelib.mgmt.image_cache import bake_images
+from starfighter_game.assets import (
+    IMAGE_CACHE_DIR,
+    IMAGE_SPECS,
+    IMAGES_DIR,
+    SCALE,
+)
+
+
+def main():
+    pygame.init()
+    # Conversion needs a display to match
+    pygame.display.set_mode((1, 1))
+    specs = dict(IMAGE_SPECS)
+    for filename in sorted(os.listdir(IMAGES_DIR)):
+        name, extension = splitext(filename)
+        if extension.lower() == ".png" and name not in specs:
+            # Not registered as an asset yet; bake it like the sprites
+            specs[name] = ImageSpec(
+                join(IMAGES_DIR, filename), scale=SCALE, transparent_pixels=True
+            )
+    count = bake_images(specs, IMAGE_CACHE_DIR)
+    print(f"Baked {count} images into {IMAGE_CACHE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
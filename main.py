@@ -1,39 +1,89 @@
 # /// script
 # dependencies = [
 #  "esper",
-#  "psygnal",
+#  "numpy",
 #  "pygame",
 # ]
 # ///
 
+import time
+
+_START_TIME = time.perf_counter()
 
 import asyncio
+import os
 import pygame
 
 # pygbag requires importing in main.py
 import esper
-import psygnal
+import numpy
 
 import sys
 
 sys.path.append("./src")
 
+from gamelib.mgmt.assets import AssetLoader
+from gamelib.mgmt.frame_governor import FrameGovernor
+from gamelib.mgmt.frame_pacer import FIXED, VSYNC, FramePacer
+from gamelib.mgmt.game_event import EVENT_BUS
+from gamelib.mgmt.game_mixer import GameMixer
+from gamelib.mgmt.gc_controller import GcController
+from gamelib.mgmt.render_thread import RenderCanvas, RenderThread
 from gamelib.mgmt.scene_base import SceneBase
-from starfighter_game.scenes import GameOverScene, MainScene
+from gamelib.mgmt.startup import StartupTimer
+from starfighter_game.assets import ASSETS
+from starfighter_game.scenes import MAIN_SCENE, LoadingScene, create_scene_manager
 from starfighter_game.sound import init_sound
 
+STARTUP = StartupTimer(_START_TIME)
+STARTUP.mark("imports")
+
 # Screen dimensions
 SCALE = 4
 WIDTH, HEIGHT = 160, 144
 
-
-async def run_game(fps: int, starting_scene: SceneBase):
+# Frame pacing: "fixed", "vsync" or "uncapped"
+PACING_MODE = FIXED
+# Busy-waiting would block the browser's event loop
+SPIN_MS = 0.0 if sys.platform == "emscripten" else 1.0
+# Blit and present on a separate thread while the next frame is simulated.
+# Not available in the browser, and macOS only presents from the main thread
+PIPELINED_RENDERING = False
+# Set to a file path to write the frame time histogram on exit
+PACING_DUMP_PATH = os.environ.get("STARFIGHTER_PACING_DUMP")
+
+
+async def run_game(fps: int, screen: pygame.Surface, pacing_mode: str):
+    # Initialized ahead of pygame.init() so its cost gets its own mark
+    pygame.mixer.init()
+    STARTUP.mark("mixer init")
     pygame.init()
-    clock = pygame.time.Clock()
+    STARTUP.mark("pygame.init")
+    pacer = FramePacer(fps, mode=pacing_mode, spin_ms=SPIN_MS)
+
+    mixer = GameMixer()
+
+    renderer = None
+    if PIPELINED_RENDERING and sys.platform not in ("emscripten", "darwin"):
+        display = screen
+        screen = RenderCanvas(display.get_size())
+        renderer = RenderThread(display, screen)
+        renderer.start()
 
-    init_sound()
+    scenes = create_scene_manager(screen)
+    budget_ms = 1000 / fps
+    governor = FrameGovernor(budget_ms)
+    gc_controller = GcController()
+    gc_controller.enable()
 
-    active_scene = starting_scene
+    def start_game() -> SceneBase:
+        init_sound(mixer)
+        print(STARTUP.report())
+        scenes.get(MAIN_SCENE).add_quality_steps(governor)
+        return scenes.enter(MAIN_SCENE)
+
+    active_scene = LoadingScene(screen, AssetLoader(ASSETS, timer=STARTUP), start_game)
+    first_frame = True
 
     while active_scene != None:
         pressed_keys = pygame.key.get_pressed()
@@ -41,6 +91,8 @@ async def run_game(fps: int, starting_scene: SceneBase):
         # Event filtering
         filtered_events = []
         for event in pygame.event.get():
+            if mixer.handle_event(event):
+                continue
             quit_attempt = False
             if event.type == pygame.QUIT:
                 quit_attempt = True
@@ -56,16 +108,58 @@ async def run_game(fps: int, starting_scene: SceneBase):
             else:
                 filtered_events.append(event)
 
-        dt = clock.tick(fps) / 1000.0
+        dt = await pacer.wait()
+        frame_start = time.perf_counter()
 
         active_scene.update(filtered_events, pressed_keys, dt)
+        # Frames skipped by the governor's render step leave the display as is
+        drew_frame = active_scene.drew_frame
 
-        active_scene = active_scene.next
-
-        pygame.display.flip()
-        await asyncio.sleep(0)
+        # Deliver events queued during the update (collisions, spawns, ...)
+        EVENT_BUS.dispatch()
 
+        if active_scene.next not in (active_scene, None):
+            # Full collection between scenes, freezing what the new one keeps
+            gc_controller.scene_changed()
+        active_scene = active_scene.next
 
-screen = pygame.display.set_mode((WIDTH * SCALE, HEIGHT * SCALE))
+        if drew_frame:
+            if renderer is None:
+                pygame.display.flip()
+            else:
+                screen.present()
+        if renderer is not None and not renderer.is_alive():
+            raise RuntimeError("Render thread stopped") from renderer.error
+        work_ms = (time.perf_counter() - frame_start) * 1000
+        governor.record(work_ms)
+        gc_controller.collect_idle(budget_ms - work_ms)
+        gc_controller.end_frame()
+        if first_frame:
+            STARTUP.mark("first frame")
+            first_frame = False
+
+    print(pacer.report())
+    if PACING_DUMP_PATH:
+        pacer.dump(PACING_DUMP_PATH)
+    print(gc_controller.report())
+    print(governor.report())
+    if renderer is not None:
+        renderer.stop()
+        print(renderer.report())
+
+
+pacing_mode = PACING_MODE
+screen = None
+if pacing_mode == VSYNC:
+    # SDL only syncs displays drawn through a renderer, which SCALED uses
+    try:
+        screen = pygame.display.set_mode(
+            (WIDTH * SCALE, HEIGHT * SCALE), pygame.SCALED, vsync=1
+        )
+    except pygame.error as e:
+        print(f"vsync unavailable ({e}), pacing frames with a timer")
+        pacing_mode = FIXED
+if screen is None:
+    screen = pygame.display.set_mode((WIDTH * SCALE, HEIGHT * SCALE))
 pygame.display.set_caption("PyFighter")
-asyncio.run(run_game(60, MainScene(screen)))
+asyncio.run(run_game(60, screen, pacing_mode))
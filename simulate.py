@@ -0,0 +1,59 @@
+"""Run many headless games in parallel and print aggregated stats.
+
+Usage:
+    python simulate.py --instances 200 --frames 3600 --policy random
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+
+sys.path.append("./src")
+
+from starfighter_game.simulation import (
+    IDLE,
+    RANDOM,
+    SCRIPTED,
+    InstanceConfig,
+    run_farm,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--instances", type=int, default=100)
+    parser.add_argument("--frames", type=int, default=3600)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--policy", choices=(IDLE, RANDOM, SCRIPTED), default=RANDOM)
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first game")
+    parser.add_argument(
+        "--script",
+        type=int,
+        nargs="*",
+        default=(),
+        help="Frames on which SPACE is pressed (scripted policy)",
+    )
+    parser.add_argument("--out", help="Write per-game stats as JSON lines")
+    args = parser.parse_args()
+
+    configs = [
+        InstanceConfig(
+            seed=args.seed + i,
+            policy=args.policy,
+            max_frames=args.frames,
+            script=tuple(args.script),
+        )
+        for i in range(args.instances)
+    ]
+    stats = run_farm(configs, processes=args.processes)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            for result in stats.instances:
+                f.write(json.dumps(asdict(result)) + "\n")
+    print(json.dumps(stats.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
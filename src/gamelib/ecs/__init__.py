@@ -1,13 +1,22 @@
 from .collision import ColliderComponent, CollisionEvent, CollisionProcessor
 from .custom import CustomProcessComponent, CustomUpdateProcessor
+from .effects import EffectProcessor, EffectSystem
+from .entities import EntityAllocator, destroy_entity
 from .geometry import (
+    BoundsRegion,
     PositionComponent,
     VelocityComponent,
     PositionBoundsComponent,
     PositionBoundsProcessor,
     MoveProcessor,
+    ParentComponent,
+    TransformProcessor,
 )
+from .probe import ProbeProcessor, Watch
 from .player import PlayerControllerComponent, PlayerMoveProcessor
 from .rendering import RenderSurfaceComponent, RenderSurfaceProcessor
+from .scheduling import SlicedProcessor, TickedProcessor, add_processor
+from .spatial import RaycastHit, SpatialIndex, SpatialIndexProcessor
 from .timer import TimerComponent, TimerProcessor
+from .tracking import ChangeQuery, changes, mark_changed
 from .modifiers.modifier import ModifierProcessor
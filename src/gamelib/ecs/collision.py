@@ -1,10 +1,12 @@
 import esper
 import pygame
-from typing import Set, Callable, Optional
+from typing import Set, Callable, Optional, Tuple
 
 from gamelib.ecs.geometry import PositionComponent
+from gamelib.ecs.tracking import ChangeQuery, tracked
 
 
+@tracked
 class ColliderComponent:
     """Component for collision detection using pygame.Rect with filtering support.
 
@@ -17,8 +19,18 @@ class ColliderComponent:
         offset_y: Y offset from PositionComponent (default 0)
         tags: Set of tags for filtering (e.g., {'enemy', 'solid'})
         ignore_tags: Set of tags to ignore during collision detection
-        on_collision: Optional callback function(entity, other_entity, tags)
+        on_collision: Optional callback function(entity, other_entity, tags),
+            called when a contact begins
+        on_collision_stay: Optional callback with the same signature, called
+            on every further frame of a contact if the processor reports
+            stay events
+        on_collision_exit: Optional callback with the same signature, called
+            when a contact ends (also when the other entity was deleted)
         mask: Optional pygame.mask.Mask for pixel-perfect collision
+        fast: Also test the path moved since the previous collision check
+            (swept AABB), so fast colliders can't tunnel through others.
+            The first check sweeps from the spawn position if the entity
+            was spawned with gamelib.ecs.spawning.with_position
         rect: pygame.Rect (automatically updated from PositionComponent)
     """
 
@@ -32,6 +44,9 @@ class ColliderComponent:
         ignore_tags: Optional[Set[str]] = None,
         on_collision: Optional[Callable] = None,
         mask: Optional[pygame.mask.Mask] = None,
+        on_collision_stay: Optional[Callable] = None,
+        on_collision_exit: Optional[Callable] = None,
+        fast: bool = False,
     ):
         self.width = width
         self.height = height
@@ -40,8 +55,13 @@ class ColliderComponent:
         self.tags = tags or set()
         self.ignore_tags = ignore_tags or set()
         self.on_collision = on_collision
+        self.on_collision_stay = on_collision_stay
+        self.on_collision_exit = on_collision_exit
         self.mask = mask
+        self.fast = fast
         self.rect = pygame.Rect(0, 0, width, height)
+        # Rect position at spawn, until the first collision check
+        self.spawn_position: Optional[Tuple[int, int]] = None
 
     @classmethod
     def from_surface(
@@ -72,6 +92,15 @@ class ColliderComponent:
         self.rect.x = position.x + self.offset_x
         self.rect.y = position.y + self.offset_y
 
+    def spawn_at(self, position: PositionComponent):
+        """Place the rect at the entity's spawn position.
+
+        Fast colliders sweep their movement before the first collision
+        check from here.
+        """
+        self.update_from_position(position)
+        self.spawn_position = (self.rect.x, self.rect.y)
+
     def collides_with(
         self, other: "ColliderComponent", pixel_perfect: bool = False
     ) -> bool:
@@ -101,8 +130,84 @@ class ColliderComponent:
         return True
 
 
+def time_of_impact(
+    rect_a: pygame.Rect,
+    start_a: Tuple[int, int],
+    rect_b: pygame.Rect,
+    start_b: Tuple[int, int],
+) -> Optional[float]:
+    """When two rects moving in straight lines first overlap (swept AABB).
+
+    Args:
+        rect_a: Current rect of the first collider
+        start_a: Its top-left corner at the start of the movement
+        rect_b: Current rect of the second collider
+        start_b: Its top-left corner at the start of the movement
+
+    Returns:
+        The fraction of the movement in [0, 1] at which the rects start to
+        overlap, or None if they don't overlap during the movement
+    """
+    # Move a relative to b, with b at its start; a's corner then has to
+    # enter b's rect grown by a's size
+    x, y = start_a
+    dx = rect_a.x - x - (rect_b.x - start_b[0])
+    dy = rect_a.y - y - (rect_b.y - start_b[1])
+    t_enter, t_exit = 0.0, 1.0
+    for position, delta, low, high in (
+        (x, dx, start_b[0] - rect_a.width, start_b[0] + rect_b.width),
+        (y, dy, start_b[1] - rect_a.height, start_b[1] + rect_b.height),
+    ):
+        if delta == 0:
+            if not low < position < high:
+                return None
+            continue
+        t0 = (low - position) / delta
+        t1 = (high - position) / delta
+        if t0 > t1:
+            t0, t1 = t1, t0
+        t_enter = max(t_enter, t0)
+        t_exit = min(t_exit, t1)
+        if t_enter >= t_exit:
+            return None
+    return t_enter
+
+
+ENTER = "enter"
+STAY = "stay"
+EXIT = "exit"
+
+_CALLBACKS = {
+    ENTER: "on_collision",
+    STAY: "on_collision_stay",
+    EXIT: "on_collision_exit",
+}
+
+
+class _RectSync:
+    """Syncs collider rects for entities whose position or collider changed."""
+
+    def __init__(self):
+        self.positions = ChangeQuery(PositionComponent)
+        self.colliders = ChangeQuery(ColliderComponent)
+
+    def reset(self):
+        self.positions.reset()
+        self.colliders.reset()
+
+    def __call__(self):
+        for entity, position in self.positions.changed():
+            collider = esper.try_component(entity, ColliderComponent)
+            if collider is not None:
+                collider.update_from_position(position)
+        for entity, collider in self.colliders.changed():
+            position = esper.try_component(entity, PositionComponent)
+            if position is not None:
+                collider.update_from_position(position)
+
+
 class CollisionEvent:
-    """Event triggered when a collision occurs."""
+    """Event triggered when a contact begins, continues or ends."""
 
     def __init__(
         self,
@@ -111,19 +216,36 @@ class CollisionEvent:
         collider_a: ColliderComponent,
         collider_b: ColliderComponent,
         overlap_point: Optional[tuple] = None,
+        kind: str = ENTER,
+        time_of_impact: Optional[float] = None,
     ):
         self.entity_a = entity_a
         self.entity_b = entity_b
         self.collider_a = collider_a
         self.collider_b = collider_b
         self.overlap_point = overlap_point
+        self.kind = kind
+        # Fraction of the frame's movement at which a swept contact began
+        self.time_of_impact = time_of_impact
 
 
 class CollisionProcessor(esper.Processor):
     """System that processes collisions using pygame collision detection.
 
     Automatically syncs ColliderComponent rects with PositionComponent before
-    checking collisions.
+    checking collisions, for the entities whose position or collider changed
+    since the last check (see gamelib.ecs.tracking).
+
+    Overlapping pairs are kept in a contact cache, so callbacks and listeners
+    get one enter event when a contact begins and one exit event when it
+    ends. Stay events for the frames in between are only reported with
+    stay_events=True. CollisionEvent objects are only created for kinds
+    that have listeners.
+
+    Colliders marked fast are also tested along the path they moved since
+    the previous check, against the pairs their swept bounds touch, so a
+    contact is found even if they passed through the other collider
+    between two checks. Swept tests ignore masks.
 
     Usage:
         world = esper.World()
@@ -134,37 +256,83 @@ class CollisionProcessor(esper.Processor):
         @collision_processor.on_collision
         def handle_collision(event):
             print(f"Collision between {event.entity_a} and {event.entity_b}")
+
+        collision_processor.add_listener(handle_separation, kind=EXIT)
     """
 
-    def __init__(self, pixel_perfect: bool = False):
+    def __init__(
+        self, pixel_perfect: bool = False, interval: int = 1, stay_events: bool = False
+    ):
         super().__init__()
-        self.collision_listeners = []
+        self.listeners: dict[str, list[Callable]] = {ENTER: [], STAY: [], EXIT: []}
+        # Enter listeners, kept under their old name
+        self.collision_listeners = self.listeners[ENTER]
         self.pixel_perfect = pixel_perfect
+        self.stay_events = stay_events
+        # Check collisions every `interval` frames; raise it to trade
+        # accuracy for time under load
+        self.interval = interval
+        self._frame = 0
+        # (entity_a, entity_b) -> (collider_a, collider_b), entity_a < entity_b
+        self.contacts: dict[
+            Tuple[int, int], Tuple[ColliderComponent, ColliderComponent]
+        ] = {}
+        # Time of impact of the contacts found by swept tests this check
+        self.impacts: dict[Tuple[int, int], float] = {}
+        # Rect positions of fast colliders at the previous check
+        self._sweep_starts: dict[int, Tuple[int, int]] = {}
+        self._sync_rects = _RectSync()
 
     def on_collision(self, func: Callable):
-        """Decorator to register collision event listeners."""
+        """Decorator to register collision enter listeners."""
         self.collision_listeners.append(func)
         return func
 
-    def add_listener(self, func: Callable):
-        """Add a collision event listener."""
-        self.collision_listeners.append(func)
+    def add_listener(self, func: Callable, kind: str = ENTER):
+        """Add a collision event listener for enter, stay or exit events."""
+        self.listeners[kind].append(func)
+
+    def clear_contacts(self):
+        """Forget all contacts without exit events, e.g. after clearing the world."""
+        self.contacts = {}
+        self._sweep_starts = {}
+        self._sync_rects.reset()
 
     def process(self, dt):
         """Check for collisions between all entities with ColliderComponents."""
-        # First, sync all collider rects with their PositionComponents
-        for entity, (collider, position) in esper.get_components(
-            ColliderComponent, PositionComponent
-        ):
-            collider.update_from_position(position)
+        self._frame += 1
+        if self._frame % self.interval:
+            return
+
+        # First, sync the collider rects of entities that moved
+        self._sync_rects()
 
         # Get all entities with colliders
         entities = esper.get_component(ColliderComponent)
         entity_list = list(entities)
 
+        # Where fast colliders moved from, and the bounds of their paths
+        previous_starts = self._sweep_starts
+        self._sweep_starts = sweep_starts = {}
+        sweeps = {}
+        for entity, collider in entity_list:
+            if collider.fast:
+                rect = collider.rect
+                sweep_starts[entity] = start = (rect.x, rect.y)
+                if entity in previous_starts:
+                    start = previous_starts[entity]
+                elif collider.spawn_position is not None:
+                    start = collider.spawn_position
+                    collider.spawn_position = None
+                if start != (rect.x, rect.y):
+                    sweeps[entity] = (start, rect.union(pygame.Rect(start, rect.size)))
+
         # Check all pairs of entities for collision
+        contacts = {}
+        self.impacts = impacts = {}
         for i in range(len(entity_list)):
             entity_a, collider_a = entity_list[i]
+            sweep_a = sweeps.get(entity_a)
 
             for j in range(i + 1, len(entity_list)):
                 entity_b, collider_b = entity_list[j]
@@ -175,28 +343,97 @@ class CollisionProcessor(esper.Processor):
 
                 # Check collision using pygame methods
                 if collider_a.collides_with(collider_b, self.pixel_perfect):
-                    # Get overlap point if using masks
-                    overlap_point = None
-                    if self.pixel_perfect and collider_a.mask and collider_b.mask:
-                        offset = (
-                            collider_b.rect.x - collider_a.rect.x,
-                            collider_b.rect.y - collider_a.rect.y,
-                        )
-                        overlap_point = collider_a.mask.overlap(collider_b.mask, offset)
-
-                    event = CollisionEvent(
-                        entity_a, entity_b, collider_a, collider_b, overlap_point
+                    impact = None
+                elif sweep_a is not None or entity_b in sweeps:
+                    impact = self._sweep(
+                        collider_a, sweep_a, collider_b, sweeps.get(entity_b)
                     )
+                    if impact is None:
+                        continue
+                else:
+                    continue
 
-                    # Call component-specific callbacks
-                    if collider_a.on_collision:
-                        collider_a.on_collision(entity_a, entity_b, collider_b.tags)
-                    if collider_b.on_collision:
-                        collider_b.on_collision(entity_b, entity_a, collider_a.tags)
+                if entity_a < entity_b:
+                    pair = entity_a, entity_b
+                    contacts[pair] = (collider_a, collider_b)
+                else:
+                    pair = entity_b, entity_a
+                    contacts[pair] = (collider_b, collider_a)
+                if impact is not None:
+                    impacts[pair] = impact
+
+        previous = self.contacts
+        self.contacts = contacts
+        for pair, colliders in contacts.items():
+            if pair not in previous:
+                self._dispatch(ENTER, pair, colliders)
+            elif self.stay_events:
+                self._dispatch(STAY, pair, colliders)
+        for pair, colliders in previous.items():
+            if pair not in contacts:
+                self._dispatch(EXIT, pair, colliders)
+
+    @staticmethod
+    def _sweep(
+        collider_a: ColliderComponent,
+        sweep_a: Optional[tuple],
+        collider_b: ColliderComponent,
+        sweep_b: Optional[tuple],
+    ) -> Optional[float]:
+        """Time of impact of two colliders, at least one of them swept."""
+        rect_a, rect_b = collider_a.rect, collider_b.rect
+        # Broad phase: the bounds of both paths have to touch
+        if not (sweep_a[1] if sweep_a else rect_a).colliderect(
+            sweep_b[1] if sweep_b else rect_b
+        ):
+            return None
+        return time_of_impact(
+            rect_a,
+            sweep_a[0] if sweep_a else (rect_a.x, rect_a.y),
+            rect_b,
+            sweep_b[0] if sweep_b else (rect_b.x, rect_b.y),
+        )
 
-                    # Notify all registered listeners
-                    for listener in self.collision_listeners:
-                        listener(event)
+    def _dispatch(
+        self,
+        kind: str,
+        pair: Tuple[int, int],
+        colliders: Tuple[ColliderComponent, ColliderComponent],
+    ):
+        entity_a, entity_b = pair
+        collider_a, collider_b = colliders
+
+        # Call component-specific callbacks
+        callback = getattr(collider_a, _CALLBACKS[kind])
+        if callback:
+            callback(entity_a, entity_b, collider_b.tags)
+        callback = getattr(collider_b, _CALLBACKS[kind])
+        if callback:
+            callback(entity_b, entity_a, collider_a.tags)
+
+        # Notify all registered listeners
+        listeners = self.listeners[kind]
+        if not listeners:
+            return
+        # Get overlap point if using masks
+        overlap_point = None
+        if self.pixel_perfect and kind != EXIT and collider_a.mask and collider_b.mask:
+            offset = (
+                collider_b.rect.x - collider_a.rect.x,
+                collider_b.rect.y - collider_a.rect.y,
+            )
+            overlap_point = collider_a.mask.overlap(collider_b.mask, offset)
+        event = CollisionEvent(
+            entity_a,
+            entity_b,
+            collider_a,
+            collider_b,
+            overlap_point,
+            kind,
+            self.impacts.get(pair) if kind == ENTER else None,
+        )
+        for listener in listeners:
+            listener(event)
 
 
 class SpatialHashProcessor(esper.Processor):
@@ -211,6 +448,7 @@ class SpatialHashProcessor(esper.Processor):
         self.collision_listeners = []
         self.pixel_perfect = pixel_perfect
         self.cell_size = cell_size
+        self._sync_rects = _RectSync()
 
     def on_collision(self, func: Callable):
         """Decorator to register collision event listeners."""
@@ -236,11 +474,8 @@ class SpatialHashProcessor(esper.Processor):
 
     def process(self):
         """Check for collisions using spatial hashing."""
-        # First, sync all collider rects with their PositionComponents
-        for entity, (collider, position) in esper.get_components(
-            ColliderComponent, PositionComponent
-        ):
-            collider.update_from_position(position)
+        # First, sync the collider rects of entities that moved
+        self._sync_rects()
 
         # Build spatial hash
         spatial_hash = {}
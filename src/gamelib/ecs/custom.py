@@ -1,8 +1,6 @@
 from abc import ABC, abstractmethod
 
-from esper import Processor
-
-
+from gamelib.ecs.scheduling import SlicedProcessor
 from gamelib.ecs.utils import get_components_with_subclasses
 
 
@@ -12,9 +10,15 @@ class CustomProcessComponent(ABC):
         pass
 
 
-class CustomUpdateProcessor(Processor):
-    def process(self, dt) -> None:
-        for entity, (custom_component,) in get_components_with_subclasses(
-            CustomProcessComponent
-        ):
-            custom_component.process()
+class CustomUpdateProcessor(SlicedProcessor):
+    """Calls process() on every CustomProcessComponent.
+
+    Give it a budget to spread the calls across frames.
+    """
+
+    def entities(self):
+        return get_components_with_subclasses(CustomProcessComponent)
+
+    def process_entity(self, entity, components, dt) -> None:
+        (custom_component,) = components
+        custom_component.process()
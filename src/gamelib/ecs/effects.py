@@ -0,0 +1,182 @@
+from typing import Sequence, Union
+
+from esper import Processor
+import numpy as np
+import pygame
+from pygame import Surface
+
+
+class EffectSystem:
+    """Short-lived sprites and particles stored outside the entity store.
+
+    Every effect is a row in preallocated arrays (position, velocity, age,
+    lifetime, animation frame). update() advances all of them in one
+    vectorized pass and compacts out expired rows; draw() issues a single
+    batched blit.
+
+    Velocities are in pixels per second. Effects emitted beyond `limit`
+    (at most `capacity`) are dropped and counted in `dropped`.
+
+    Usage:
+        effects = EffectSystem()
+        effects.register_sprite("explosion", [frame_1, frame_2], frame_time=0.1)
+        effects.emit("explosion", x, y, lifetime=0.2)
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.limit = capacity
+        self.count = 0
+        self.dropped = 0
+
+        self.position = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.float32)
+        self.sprite = np.zeros(capacity, dtype=np.int32)
+        # Index into self.frames
+        self.frame = np.zeros(capacity, dtype=np.int32)
+        self._arrays = (
+            self.position,
+            self.velocity,
+            self.age,
+            self.lifetime,
+            self.sprite,
+            self.frame,
+        )
+
+        self.frames: list[Surface] = []
+        self.sprite_ids: dict[str, int] = {}
+        self._first_frame = np.zeros(0, dtype=np.int32)
+        self._frame_count = np.zeros(0, dtype=np.int32)
+        self._frame_time = np.zeros(0, dtype=np.float32)
+        self._rng = np.random.default_rng()
+
+    def register_sprite(
+        self, name: str, frames: Sequence[Surface], frame_time: float = 0.1
+    ) -> int:
+        """Register an animation (or a single surface) and return its id."""
+        sprite_id = len(self.sprite_ids)
+        self.sprite_ids[name] = sprite_id
+        self._first_frame = np.append(self._first_frame, len(self.frames))
+        self._frame_count = np.append(self._frame_count, len(frames))
+        self._frame_time = np.append(self._frame_time, np.float32(frame_time))
+        self.frames.extend(frames)
+        return sprite_id
+
+    def emit(
+        self,
+        sprite: Union[str, int],
+        x: float,
+        y: float,
+        vx: float = 0,
+        vy: float = 0,
+        lifetime: float = 0.2,
+    ) -> bool:
+        """Add a single effect. Returns False if it was dropped."""
+        i = self.count
+        if i >= self.limit:
+            self.dropped += 1
+            return False
+        sprite_id = self.sprite_ids[sprite] if isinstance(sprite, str) else sprite
+        self.position[i] = (x, y)
+        self.velocity[i] = (vx, vy)
+        self.age[i] = 0
+        self.lifetime[i] = lifetime
+        self.sprite[i] = sprite_id
+        self.frame[i] = self._first_frame[sprite_id]
+        self.count = i + 1
+        return True
+
+    def emit_burst(
+        self,
+        sprite: Union[str, int],
+        x: float,
+        y: float,
+        amount: int,
+        speed: float,
+        lifetime: float = 0.3,
+    ) -> int:
+        """Add `amount` effects flying out from (x, y) in random directions.
+
+        Returns:
+            The number of effects actually emitted
+        """
+        start = self.count
+        emitted = min(amount, max(self.limit - start, 0))
+        self.dropped += amount - emitted
+        amount = emitted
+        if amount <= 0:
+            return 0
+        end = start + amount
+        sprite_id = self.sprite_ids[sprite] if isinstance(sprite, str) else sprite
+        angles = self._rng.uniform(0, 2 * np.pi, amount)
+        speeds = self._rng.uniform(0.5 * speed, speed, amount)
+        self.position[start:end] = (x, y)
+        self.velocity[start:end, 0] = np.cos(angles) * speeds
+        self.velocity[start:end, 1] = np.sin(angles) * speeds
+        self.age[start:end] = 0
+        self.lifetime[start:end] = lifetime
+        self.sprite[start:end] = sprite_id
+        self.frame[start:end] = self._first_frame[sprite_id]
+        self.count = end
+        return amount
+
+    def clear(self):
+        self.count = 0
+
+    def update(self, dt: float):
+        n = self.count
+        if n == 0:
+            return
+        age = self.age[:n]
+        age += dt
+        self.position[:n] += self.velocity[:n] * dt
+
+        alive = age < self.lifetime[:n]
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            n = self.count = len(keep)
+            for array in self._arrays:
+                array[:n] = array[keep]
+            if n == 0:
+                return
+
+        sprite = self.sprite[:n]
+        local_frame = (self.age[:n] / self._frame_time[sprite]).astype(np.int32)
+        np.minimum(local_frame, self._frame_count[sprite] - 1, out=local_frame)
+        self.frame[:n] = self._first_frame[sprite] + local_frame
+
+    def draw(self, surface: Surface):
+        n = self.count
+        if n == 0:
+            return
+        frames = self.frames
+        surface.blits(
+            [
+                (frames[frame], position)
+                for frame, position in zip(
+                    self.frame[:n].tolist(),
+                    self.position[:n].astype(np.int32).tolist(),
+                )
+            ],
+            doreturn=False,
+        )
+
+
+class EffectProcessor(Processor):
+    """Updates and draws an EffectSystem once per frame.
+
+    Effects keep updating while drawing is disabled.
+    """
+
+    def __init__(self, effects: EffectSystem, screen: pygame.Surface):
+        super().__init__()
+        self.effects = effects
+        self.screen = screen
+        self.enabled = True
+
+    def process(self, dt):
+        self.effects.update(dt)
+        if self.enabled:
+            self.effects.draw(self.screen)
@@ -0,0 +1,173 @@
+"""Recycled entity IDs with generation counters.
+
+An EntityAllocator replaces a world's ever-increasing entity counter (see
+gamelib.ecs.worlds.use_entity_allocator). Entity IDs it hands out are
+handles combining a slot index and the slot's generation:
+
+    handle = generation << INDEX_BITS | index
+
+Slots of deleted entities are reused with the next generation, so the set
+of indices stays as large as the peak entity count. A handle kept after
+its entity was deleted never equals the handle of the slot's next
+occupant, so esper.entity_exists(), is_current() and destroy_entity()
+recognize it as stale instead of acting on an unrelated entity.
+
+Generations wrap after 2**GENERATION_BITS reuses of a slot; free slots are
+reused oldest first so that takes as long as possible. Handles fit in 32
+bits, as snapshots store them.
+"""
+
+from collections import deque
+
+import esper
+
+INDEX_BITS = 16
+GENERATION_BITS = 16
+INDEX_MASK = (1 << INDEX_BITS) - 1
+GENERATION_MASK = (1 << GENERATION_BITS) - 1
+# Reclaim deleted slots after at least this many allocations
+_MIN_RECLAIM_INTERVAL = 64
+
+
+def entity_index(entity: int) -> int:
+    return entity & INDEX_MASK
+
+
+def entity_generation(entity: int) -> int:
+    return entity >> INDEX_BITS
+
+
+def destroy_entity(entity: int) -> bool:
+    """Delete an entity of the current world unless the handle is stale.
+
+    Unlike esper.delete_entity, deleting an entity twice or through a
+    stale handle is not an error.
+
+    Returns:
+        Whether the entity was alive
+    """
+    if not esper.entity_exists(entity):
+        return False
+    esper.delete_entity(entity)
+    return True
+
+
+class EntityAllocator:
+    """Entity ID source for one esper world, recycling deleted IDs.
+
+    Works as the iterator esper draws new IDs from. Deletions aren't
+    reported to it: slots whose handle left the world's entity store are
+    reclaimed in one pass once as many IDs were allocated as entities are
+    alive, which keeps the cost per allocation constant.
+
+    Args:
+        entities: The world's entity store (esper._entities)
+    """
+
+    def __init__(self, entities: dict):
+        self._entities = entities
+        # Indexed by slot; slot 0 is never used so handles stay truthy
+        self.generations: list[int] = [0]
+        self._handles: list[int] = [0]
+        self._free: deque[int] = deque()
+        self._since_reclaim = 0
+        self.recycled = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._handles) - 1
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> int:
+        if not self._free and self._since_reclaim >= max(
+            _MIN_RECLAIM_INTERVAL, len(self._entities)
+        ):
+            self.reclaim()
+        self._since_reclaim += 1
+
+        if self._free:
+            index = self._free.popleft()
+            self.recycled += 1
+        else:
+            index = len(self._handles)
+            if index > INDEX_MASK:
+                self.reclaim()
+                if not self._free:
+                    raise OverflowError(f"More than {INDEX_MASK} live entities")
+                index = self._free.popleft()
+            else:
+                self.generations.append(0)
+                self._handles.append(0)
+        handle = self.generations[index] << INDEX_BITS | index
+        self._handles[index] = handle
+        return handle
+
+    def reclaim(self) -> int:
+        """Free the slots of entities deleted since the previous pass.
+
+        Returns:
+            The number of freed slots
+        """
+        entities = self._entities
+        handles = self._handles
+        generations = self.generations
+        freed = 0
+        for index in range(1, len(handles)):
+            handle = handles[index]
+            if handle and handle not in entities:
+                handles[index] = 0
+                generations[index] = (generations[index] + 1) & GENERATION_MASK
+                self._free.append(index)
+                freed += 1
+        self._since_reclaim = 0
+        return freed
+
+    def is_current(self, entity: int) -> bool:
+        """Whether entity is the handle of its slot's live occupant."""
+        index = entity & INDEX_MASK
+        return (
+            0 < index < len(self._handles)
+            and self._handles[index] == entity
+            and entity in self._entities
+        )
+
+    def clear(self):
+        """Free every slot, e.g. after the world was cleared.
+
+        Generations are kept, so handles from before stay stale.
+        """
+        self.rebuild()
+
+    def rebuild(self):
+        """Resynchronize with the entities currently in the world.
+
+        Needed after entities were put into the store without drawing IDs
+        from the allocator, e.g. when restoring a snapshot. Raises
+        ValueError if two of them share a slot index, as IDs from a world
+        that didn't recycle them can.
+        """
+        live = {}
+        for entity in self._entities:
+            index = entity & INDEX_MASK
+            other = live.setdefault(index, entity)
+            if other != entity:
+                raise ValueError(
+                    f"Entities {other} and {entity} share slot index {index}"
+                )
+        size = max(len(self._handles), max(live, default=0) + 1)
+        self.generations.extend([0] * (size - len(self.generations)))
+        self._handles = [0] * size
+        self._free.clear()
+        for index in range(1, size):
+            entity = live.get(index)
+            if entity is not None:
+                self._handles[index] = entity
+                self.generations[index] = entity >> INDEX_BITS
+            else:
+                self.generations[index] = (
+                    self.generations[index] + 1
+                ) & GENERATION_MASK
+                self._free.append(index)
+        self._since_reclaim = 0
@@ -1,12 +1,17 @@
 # Component Definitions
+from collections import defaultdict
 from collections.abc import Callable
-from typing import Any, Tuple
+from typing import Any, Optional, Tuple
 from dataclasses import dataclass
 from esper import Processor
 import esper
 import pygame
+import warnings
 
+from gamelib.ecs.tracking import ChangeQuery, changes, tracked
 
+
+@tracked
 @dataclass
 class PositionComponent:
     x: int
@@ -19,6 +24,20 @@ class VelocityComponent:
     multiplier: float = 1
 
 
+@tracked
+@dataclass
+class ParentComponent:
+    """Attaches an entity to a parent entity at a local offset.
+
+    The entity's own PositionComponent holds its world position, which
+    TransformProcessor keeps at the parent's position plus the offset.
+    """
+
+    parent: int
+    offset_x: int = 0
+    offset_y: int = 0
+
+
 @dataclass
 class RectComponent:
     pos: PositionComponent
@@ -30,34 +49,192 @@ class RectComponent:
         return pygame.Rect(self.pos.x, self.pos.y, self.width, self.height)
 
 
-@dataclass
-class PositionBoundsComponent:
+# Out-of-bounds policies
+DESPAWN = "despawn"
+CALLBACK = "callback"
+
+
+@dataclass(frozen=True, eq=False)
+class BoundsRegion:
+    """Named rectangle entities have to stay in, shared by all of them.
+
+    With the DESPAWN policy entities leaving the region are deleted; with
+    CALLBACK on_out_of_bounds(entity) is called instead.
+    """
+
+    name: str
     min_x: int
     max_x: int
     min_y: int
     max_y: int
-    on_out_of_bounds: Callable[[int], Any]
+    policy: str = DESPAWN
+    on_out_of_bounds: Optional[Callable[[int], Any]] = None
+
+
+def delete_out_of_bounds(entity: int) -> None:
+    """Deprecated on_out_of_bounds callback; use a DESPAWN region instead."""
+    esper.delete_entity(entity)
+
+
+@dataclass(init=False)
+class PositionBoundsComponent:
+    """Keeps an entity inside a shared BoundsRegion.
+
+    The old form PositionBoundsComponent(min_x, max_x, min_y, max_y,
+    on_out_of_bounds) is deprecated. It creates an anonymous region per
+    component, with the DESPAWN policy for delete_out_of_bounds and
+    CALLBACK otherwise. Anonymous regions can't be stored in snapshots.
+    """
+
+    region: BoundsRegion
+
+    def __init__(self, region: Optional[BoundsRegion] = None, *args, **kwargs):
+        if isinstance(region, BoundsRegion) and not args and not kwargs:
+            self.region = region
+            return
+        warnings.warn(
+            "PositionBoundsComponent(min_x, max_x, min_y, max_y, "
+            "on_out_of_bounds) is deprecated, pass a BoundsRegion",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        if region is not None:
+            args = (region, *args)
+        self.region = _anonymous_region(*args, **kwargs)
+
+
+def _anonymous_region(
+    min_x: int,
+    max_x: int,
+    min_y: int,
+    max_y: int,
+    on_out_of_bounds: Callable[[int], Any],
+) -> BoundsRegion:
+    if on_out_of_bounds is delete_out_of_bounds:
+        return BoundsRegion("anonymous", min_x, max_x, min_y, max_y)
+    return BoundsRegion(
+        "anonymous", min_x, max_x, min_y, max_y, CALLBACK, on_out_of_bounds
+    )
 
 
 class MoveProcessor(Processor):
     def process(self, dt):
+        moved = changes(PositionComponent)
         for entity, (speed_comp, pos) in esper.get_components(
             VelocityComponent, PositionComponent
         ):
             # TO-DO: Factor for dt
             pos.x += speed_comp.base_speed[0]
             pos.y += speed_comp.base_speed[1]
+            moved.add(entity)
 
 
 class PositionBoundsProcessor(Processor):
+    """Applies the policy of their bounds region to entities outside it.
+
+    Out-of-bounds entities are collected in one pass and handled per
+    region afterwards; `despawned` counts the deleted entities by region
+    name.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.despawned: dict[str, int] = defaultdict(int)
+
     def process(self, dt):
+        outside: dict[BoundsRegion, list[int]] = {}
         for entity, (pos, bounds) in esper.get_components(
             PositionComponent, PositionBoundsComponent
         ):
-            if (
-                pos.x < bounds.min_x
-                or pos.x > bounds.max_x
-                or pos.y < bounds.min_y
-                or pos.y > bounds.max_y
+            region = bounds.region
+            if not (
+                region.min_x <= pos.x <= region.max_x
+                and region.min_y <= pos.y <= region.max_y
             ):
-                bounds.on_out_of_bounds(entity)
+                outside.setdefault(region, []).append(entity)
+
+        for region, entities in outside.items():
+            if region.policy == DESPAWN:
+                for entity in entities:
+                    esper.delete_entity(entity)
+                self.despawned[region.name] += len(entities)
+            else:
+                for entity in entities:
+                    region.on_out_of_bounds(entity)
+
+
+class TransformProcessor(Processor):
+    """Moves attached entities along with their parents.
+
+    Only the subtrees of parents that moved, or whose children were
+    attached or re-attached, are recomputed, so entities attached to a
+    parent that stands still cost nothing. Children are deleted together
+    with their parent.
+
+    Usage:
+        muzzle = esper.create_entity(
+            PositionComponent(0, 0), ParentComponent(player, offset_x=32)
+        )
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.children: dict[int, set[int]] = defaultdict(set)
+        self._links = ChangeQuery(ParentComponent)
+        self._moves = ChangeQuery(PositionComponent)
+
+    def clear(self):
+        """Forget the hierarchy, e.g. after replacing the world."""
+        self.children.clear()
+        self._links.reset()
+        self._moves.reset()
+
+    def process(self, dt):
+        relinked = set()
+        for child, link in self._links.changed():
+            self.children[link.parent].add(child)
+            relinked.add(link.parent)
+        moved = {entity for entity, _ in self._moves.changed()}
+
+        for parent in list(self.children):
+            if not esper.entity_exists(parent):
+                self._delete_children(parent)
+                continue
+            position = esper.try_component(parent, PositionComponent)
+            if position is not None and (parent in relinked or parent in moved):
+                self._propagate(parent, position)
+
+        # Positions written above don't count as moves next frame
+        self._moves.skip()
+
+    def _propagate(self, root: int, root_position: PositionComponent):
+        moved = changes(PositionComponent)
+        stack = [(root, root_position)]
+        while stack:
+            parent, parent_position = stack.pop()
+            children = self.children.get(parent)
+            if not children:
+                continue
+            for child in list(children):
+                link = esper.try_component(child, ParentComponent)
+                position = esper.try_component(child, PositionComponent)
+                if link is None or link.parent != parent or position is None:
+                    # Detached or re-attached elsewhere
+                    children.discard(child)
+                    continue
+                position.x = parent_position.x + link.offset_x
+                position.y = parent_position.y + link.offset_y
+                moved.add(child)
+                stack.append((child, position))
+            if not children:
+                del self.children[parent]
+
+    def _delete_children(self, root: int):
+        stack = [root]
+        while stack:
+            parent = stack.pop()
+            for child in self.children.pop(parent, ()):
+                link = esper.try_component(child, ParentComponent)
+                if link is not None and link.parent == parent:
+                    esper.delete_entity(child)
+                    stack.append(child)
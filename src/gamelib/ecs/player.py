@@ -1,10 +1,12 @@
 from dataclasses import dataclass
+from typing import Callable, Sequence
 
 from esper import Processor
 import esper
 import pygame
 
 from gamelib.ecs.geometry import PositionComponent
+from gamelib.ecs.tracking import changes
 
 
 @dataclass
@@ -18,13 +20,30 @@ class PlayerControllerComponent:
 
 
 class PlayerMoveProcessor(Processor):
+    """Moves players and flips their direction on SPACE.
+
+    Args:
+        keys: Returns the current key state, indexable by key code
+        clock: Returns the current time in milliseconds
+    """
+
+    def __init__(
+        self,
+        keys: Callable[[], Sequence[bool]] = pygame.key.get_pressed,
+        clock: Callable[[], int] = pygame.time.get_ticks,
+    ):
+        super().__init__()
+        self.keys = keys
+        self.clock = clock
+
     def process(self, dt):
+        moved = changes(PositionComponent)
         for entity, player in esper.get_component(PlayerControllerComponent):
             if not esper.has_component(entity, PositionComponent):
                 continue
             pos = esper.component_for_entity(entity, PositionComponent)
-            keys = pygame.key.get_pressed()
-            current_time = pygame.time.get_ticks()
+            keys = self.keys()
+            current_time = self.clock()
             if (
                 keys[pygame.K_SPACE]
                 and (current_time - player.last_space_time) > player.refractory_period
@@ -39,3 +58,4 @@ class PlayerMoveProcessor(Processor):
                 player.base_speed = -abs(player.base_speed)
 
             pos.x += player.base_speed
+            moved.add(entity)
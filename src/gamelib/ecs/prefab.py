@@ -0,0 +1,77 @@
+from typing import Any, Callable, Iterable, Optional, Sequence, Tuple
+
+from gamelib.ecs.spawning import create_entities, spawn_batch, with_position
+
+_interned_tags: dict[frozenset, frozenset] = {}
+
+
+def intern_tags(*tags: str) -> frozenset:
+    """Return a shared frozenset for a tag combination."""
+    key = frozenset(tags)
+    return _interned_tags.setdefault(key, key)
+
+
+class Prefab:
+    """Entity template that shares immutable components between instances.
+
+    Args:
+        name: Prefab name
+        shared: Component instances added by reference to every entity;
+            they must not hold per-entity state
+        factories: Callables building the per-entity components (anything
+            mutated at runtime, e.g. velocities or collider rects)
+
+    A PositionComponent is added on spawn if no factory provides one.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        shared: Iterable[Any] = (),
+        factories: Iterable[Callable[[], Any]] = (),
+    ):
+        self.name = name
+        self.shared = tuple(shared)
+        self.factories = tuple(factories)
+
+    def components(self) -> list[Any]:
+        components = list(self.shared)
+        components.extend(factory() for factory in self.factories)
+        return components
+
+    def spawn(self, position: Tuple[int, int]) -> int:
+        return create_entities([with_position(self.components(), position)])[0]
+
+    def spawn_many(self, positions: Sequence[Tuple[int, int]]) -> list[int]:
+        return spawn_batch(self.components, positions)
+
+
+class PrefabRegistry:
+    """Prefabs by name, built on first use.
+
+    Building lazily lets prefabs reference assets that are only available
+    once loading has finished.
+    """
+
+    def __init__(self):
+        self._builders: dict[str, Callable[[], Prefab]] = {}
+        self._prefabs: dict[str, Prefab] = {}
+
+    def register(self, name: str, builder: Callable[[], Prefab]):
+        if name in self._builders:
+            raise KeyError(f"Prefab {name!r} is already registered")
+        self._builders[name] = builder
+
+    def __getitem__(self, name: str) -> Prefab:
+        prefab = self._prefabs.get(name)
+        if prefab is None:
+            prefab = self._prefabs[name] = self._builders[name]()
+        return prefab
+
+    def names(self) -> list[str]:
+        return list(self._builders)
+
+    def get(self, name: str) -> Optional[Prefab]:
+        if name not in self._builders:
+            return None
+        return self[name]
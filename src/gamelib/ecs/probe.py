@@ -1,17 +1,188 @@
+import json
+import operator
+import time
+import warnings
 from collections.abc import Callable
-from dataclasses import dataclass
-from typing import Any
+from typing import Any, Optional, Sequence
 
 import esper
+import numpy as np
+
+
+class Watch:
+    """Samples one field of a component type at a fixed frame interval.
+
+    Every sampling pass reads the field from at most max_entities entities,
+    so the cost stays bounded however many entities have the component.
+    Each pass continues after the entities the previous one read, so over
+    several passes all entities are sampled.
+    Samples go into a ring buffer of the latest `capacity` values and are
+    aggregated into count/sum/min/max and, if bucket edges are given, a
+    histogram until the next flush.
+
+    Args:
+        name: Name in the telemetry output
+        component_type: Component to read
+        field: Attribute name, dotted for nested attributes ("rect.x")
+        every: Sample every n frames
+        max_entities: Entities read per sampling pass
+        capacity: Size of the ring buffer of recent samples
+        buckets: Histogram bucket edges, ascending
+    """
+
+    def __init__(
+        self,
+        name: str,
+        component_type: type,
+        field: str,
+        every: int = 30,
+        max_entities: int = 64,
+        capacity: int = 256,
+        buckets: Optional[Sequence[float]] = None,
+    ):
+        self.name = name
+        self.component_type = component_type
+        self.field = field
+        self.every = every
+        self.max_entities = max_entities
+        self.recent = np.zeros(capacity, dtype=np.float64)
+        self.recent_count = 0
+        self.buckets = None if buckets is None else np.asarray(buckets, np.float64)
+        self._get = operator.attrgetter(field)
+        self._values: list[float] = []
+        self._offset = 0
+        self.reset_aggregates()
+
+    def reset_aggregates(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = float("-inf")
+        if self.buckets is not None:
+            self.histogram = np.zeros(len(self.buckets) + 1, dtype=np.int64)
+
+    def sample(self):
+        values = self._values
+        values.clear()
+        get = self._get
+        limit = self.max_entities
+        components = esper.get_component(self.component_type)
+        if len(components) > limit:
+            start = self._offset % len(components)
+            self._offset = start + limit
+            components = (
+                components[start : start + limit]
+                + components[: max(0, start + limit - len(components))]
+            )
+        for _, component in components:
+            values.append(get(component))
+        if values:
+            self.add(values)
+
+    def add(self, values: Sequence[float]):
+        samples = np.asarray(values, dtype=np.float64)
+        capacity = len(self.recent)
+        slots = (self.recent_count + np.arange(len(samples))) % capacity
+        self.recent[slots[-capacity:]] = samples[-capacity:]
+        self.recent_count += len(samples)
+
+        self.count += len(samples)
+        self.total += float(samples.sum())
+        self.minimum = min(self.minimum, float(samples.min()))
+        self.maximum = max(self.maximum, float(samples.max()))
+        if self.buckets is not None:
+            np.add.at(
+                self.histogram, np.searchsorted(self.buckets, samples, "right"), 1
+            )
+
+    def summary(self) -> dict[str, Any]:
+        data: dict[str, Any] = {"watch": self.name, "samples": self.count}
+        if self.count:
+            data.update(
+                mean=self.total / self.count, min=self.minimum, max=self.maximum
+            )
+        if self.buckets is not None:
+            data["buckets"] = self.buckets.tolist()
+            data["histogram"] = self.histogram.tolist()
+        return data
 
 
-@dataclass
 class ProbeComponent:
-    component: object
-    callable: Callable
+    """Deprecated: calls callable(entity, component) every frame.
 
+    Use a Watch on the component's type instead. ProbeProcessor still runs
+    these, through a watch that samples every frame.
+    """
 
-class ProbeProcessor(esper.Processor):
-    def process(self, dt) -> None:
+    def __init__(self, component: object, callable: Callable):
+        warnings.warn(
+            "ProbeComponent is deprecated, pass a Watch to ProbeProcessor",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        self.component = component
+        self.callable = callable
+
+
+class _ProbeWatch(Watch):
+    """Runs the callables of ProbeComponents instead of reading a field."""
+
+    def __init__(self):
+        super().__init__("probes", ProbeComponent, "component", every=1)
+
+    def sample(self):
         for entity, probe in esper.get_component(ProbeComponent):
             probe.callable(entity, probe.component)
+
+
+class ProbeProcessor(esper.Processor):
+    """Samples watches and periodically appends their aggregates to a file.
+
+    Each flush writes one JSON line per watch that has samples and resets
+    the aggregates; the ring buffers keep the latest values. Telemetry is
+    disabled by not adding the processor at all. The callables of
+    deprecated ProbeComponents run every frame.
+
+    Usage:
+        probes = ProbeProcessor(
+            [Watch("asteroid_y", PositionComponent, "y", every=60)],
+            path="telemetry.jsonl",
+        )
+        esper.add_processor(probes, priority=-100)
+    """
+
+    def __init__(
+        self,
+        watches: Sequence[Watch] = (),
+        path: Optional[str] = None,
+        flush_interval_s: float = 10.0,
+    ):
+        super().__init__()
+        self.watches = list(watches)
+        self._probes = _ProbeWatch()
+        self.path = path
+        self.flush_interval_s = flush_interval_s
+        self._frame = 0
+        self._since_flush = 0.0
+
+    def process(self, dt) -> None:
+        self._frame = frame = self._frame + 1
+        for watch in self.watches:
+            if frame % watch.every == 0:
+                watch.sample()
+        self._probes.sample()
+        self._since_flush += dt
+        if self._since_flush >= self.flush_interval_s:
+            self.flush()
+
+    def flush(self):
+        self._since_flush = 0.0
+        lines = []
+        now = time.time()
+        for watch in self.watches:
+            if watch.count:
+                lines.append(json.dumps({"time": now, **watch.summary()}))
+            watch.reset_aggregates()
+        if self.path and lines:
+            with open(self.path, "a") as f:
+                f.write("\n".join(lines) + "\n")
@@ -66,8 +66,11 @@ class RenderSurfaceProcessor(Processor):
     def __init__(self, screen: Surface):
         super().__init__()
         self.screen = screen
+        self.enabled = True
 
     def process(self, dt):
+        if not self.enabled:
+            return
         for entity, (position, surface) in esper.get_components(
             PositionComponent, RenderSurfaceComponent
         ):
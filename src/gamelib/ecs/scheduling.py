@@ -0,0 +1,155 @@
+"""Tick rates and time slicing for processors.
+
+Register processors through add_processor to run them below the frame
+rate or to spread their entities over several frames:
+
+    add_processor(PositionBoundsProcessor(), priority=97, interval_s=0.25)
+    add_processor(CustomUpdateProcessor(), priority=80, budget_ms=0.5)
+
+A processor with a tick interval runs once the interval has elapsed and
+gets the time accumulated since its previous run as dt. A SlicedProcessor
+processes its entities from a cursor until its budget is used up and
+resumes from there next frame; every entity gets the time since it was
+last processed as dt.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Optional, Tuple
+
+import esper
+
+# Absorbs rounding when frame times add up to exactly the interval
+_EPSILON = 1e-9
+
+
+class TickedProcessor(esper.Processor):
+    """Runs a processor every interval_s seconds with the accumulated dt.
+
+    The wrapped processor is available as `processor`.
+    """
+
+    def __init__(self, processor: esper.Processor, interval_s: float):
+        super().__init__()
+        self.processor = processor
+        self.interval_s = interval_s
+        self.elapsed_s = 0.0
+
+    def process(self, dt, *args, **kwargs):
+        self.elapsed_s += dt
+        if self.elapsed_s + _EPSILON < self.interval_s:
+            return
+        elapsed, self.elapsed_s = self.elapsed_s, 0.0
+        self.processor.process(elapsed, *args, **kwargs)
+
+
+class SlicedProcessor(esper.Processor, ABC):
+    """Base class for processors that can spread their work across frames.
+
+    Subclasses implement entities() and process_entity(). Each frame the
+    processor continues the current sweep over the entities until
+    max_entities entities were processed or budget_ms has passed, and starts
+    a new sweep once the previous one is finished. Entities deleted during a
+    sweep are skipped; entities created during a sweep join the next one.
+    Without limits every sweep finishes in the frame it started.
+
+    Args:
+        budget_ms: Time per frame, checked after each entity
+        max_entities: Entities processed per frame
+    """
+
+    def __init__(
+        self, budget_ms: Optional[float] = None, max_entities: Optional[int] = None
+    ):
+        super().__init__()
+        self.budget_ms = budget_ms
+        self.max_entities = max_entities
+        self._time = 0.0
+        self._sweep: list[Tuple[int, Any]] = []
+        self._cursor = 0
+        # Time each entity was processed in the previous and current sweep
+        self._processed_at: dict[int, float] = {}
+        self._sweep_processed_at: dict[int, float] = {}
+
+    @abstractmethod
+    def entities(self) -> Iterable[Tuple[int, Any]]:
+        """The (entity, components) pairs to process in a sweep."""
+        pass
+
+    @abstractmethod
+    def process_entity(self, entity: int, components: Any, dt: float) -> None:
+        pass
+
+    @property
+    def sweep_done(self) -> bool:
+        return self._cursor >= len(self._sweep)
+
+    def process(self, dt):
+        self._time = now = self._time + dt
+        if self.sweep_done:
+            self._processed_at = self._sweep_processed_at
+            self._sweep_processed_at = {}
+            self._sweep = list(self.entities())
+            self._cursor = 0
+
+        sweep = self._sweep
+        processed_at = self._processed_at
+        sweep_processed_at = self._sweep_processed_at
+        limit = self.max_entities
+        deadline = (
+            None
+            if self.budget_ms is None
+            else time.perf_counter() + self.budget_ms / 1000
+        )
+        count = 0
+        while self._cursor < len(sweep):
+            entity, components = sweep[self._cursor]
+            self._cursor += 1
+            if not esper.entity_exists(entity):
+                continue
+            self.process_entity(
+                entity, components, now - processed_at.get(entity, now - dt)
+            )
+            sweep_processed_at[entity] = now
+            count += 1
+            if limit is not None and count >= limit:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+    def restart(self):
+        """Drop the current sweep, e.g. after the world was replaced."""
+        self._sweep = []
+        self._cursor = 0
+        self._processed_at = {}
+        self._sweep_processed_at = {}
+
+
+def add_processor(
+    processor: esper.Processor,
+    priority: int = 0,
+    interval_s: float = 0.0,
+    budget_ms: Optional[float] = None,
+) -> esper.Processor:
+    """Add a processor to the current world with an optional schedule.
+
+    Args:
+        processor: Processor to add
+        priority: Processors with higher priority run first
+        interval_s: Seconds between runs; 0 runs every frame
+        budget_ms: Time slice per frame, only for SlicedProcessors
+
+    Returns:
+        The processor as registered with esper, a TickedProcessor wrapping
+        it if an interval is given
+    """
+    if budget_ms is not None:
+        if not isinstance(processor, SlicedProcessor):
+            raise TypeError(
+                f"{type(processor).__qualname__} does not support time slicing"
+            )
+        processor.budget_ms = budget_ms
+    if interval_s > 0:
+        processor = TickedProcessor(processor, interval_s)
+    esper.add_processor(processor, priority)
+    return processor
@@ -0,0 +1,460 @@
+"""Binary snapshots of the current esper world.
+
+Components are stored field by field (from their ``__dict__``) using a
+per-type schema, so snapshots stay compact and restore in a single linear
+pass. Values that can't be serialized by value -- callbacks, shared
+surfaces, spawner methods -- must be registered as named references on a
+SnapshotRegistry; nothing is pickled.
+
+Usage:
+    registry = SnapshotRegistry()
+    registry.register_types(MyComponent)
+    registry.register_ref("asteroid_sprite", asteroid_surface)
+    data = save_world(registry)
+    ...
+    restore_world(data, registry)
+"""
+
+import functools
+import struct
+from typing import Any, Iterable, Optional
+
+import esper
+import pygame
+
+from gamelib.ecs.tracking import changes, is_tracked
+from gamelib.ecs.worlds import clear_world, sync_entity_counter
+
+MAGIC = b"GSNP"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sH")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_ENTITY = struct.Struct("<IH")
+_RECT = struct.Struct("<4i")
+_SIZE = struct.Struct("<II")
+
+(
+    TAG_NONE,
+    TAG_FALSE,
+    TAG_TRUE,
+    TAG_INT,
+    TAG_FLOAT,
+    TAG_STR,
+    TAG_TUPLE,
+    TAG_LIST,
+    TAG_SET,
+    TAG_REF,
+    TAG_PARTIAL,
+    TAG_RECT,
+    TAG_SURFACE,
+    TAG_MASK,
+    TAG_OBJECT,
+    TAG_COMPONENT,
+) = range(16)
+
+_TAGGED_INT = struct.Struct("<Bq")
+_TAGGED_FLOAT = struct.Struct("<Bd")
+_TAGGED_U32 = struct.Struct("<BI")
+_TAGGED_RECT = struct.Struct("<B4i")
+_CONSTANTS = [bytes((tag,)) for tag in range(TAG_COMPONENT + 1)]
+
+_SEQUENCE_TAGS = {tuple: TAG_TUPLE, list: TAG_LIST, set: TAG_SET, frozenset: TAG_SET}
+_SEQUENCE_TYPES = {TAG_TUPLE: tuple, TAG_LIST: list, TAG_SET: set}
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+class SnapshotError(Exception):
+    pass
+
+
+class SnapshotRegistry:
+    """Types and named references a snapshot may contain."""
+
+    def __init__(self):
+        self._types: dict[str, type] = {}
+        self._type_names: dict[type, str] = {}
+        self._refs: dict[str, Any] = {}
+        self._ref_names: dict[Any, str] = {}
+
+    def register_types(self, *types: type):
+        """Allow instances of these classes to be stored by value."""
+        for cls in types:
+            name = f"{cls.__module__}.{cls.__qualname__}"
+            self._types[name] = cls
+            self._type_names[cls] = name
+
+    def register_ref(self, name: str, obj: Any):
+        """Store obj (a callback, surface, ...) by name instead of by value."""
+        self._refs[name] = obj
+        self._ref_names[obj] = name
+
+    def type_name(self, cls: type) -> Optional[str]:
+        return self._type_names.get(cls)
+
+    def type_for(self, name: str) -> type:
+        try:
+            return self._types[name]
+        except KeyError:
+            raise SnapshotError(f"Unregistered type {name!r}") from None
+
+    def ref_name(self, obj: Any) -> Optional[str]:
+        try:
+            return self._ref_names.get(obj)
+        except TypeError:
+            # Unhashable values can't be registered references
+            return None
+
+    def ref_for(self, name: str) -> Any:
+        try:
+            return self._refs[name]
+        except KeyError:
+            raise SnapshotError(f"Unregistered reference {name!r}") from None
+
+
+def default_registry() -> SnapshotRegistry:
+    """Registry with the gamelib component types and shared callbacks."""
+    from gamelib.ecs.collision import ColliderComponent
+    from gamelib.ecs.geometry import (
+        ParentComponent,
+        PositionBoundsComponent,
+        PositionComponent,
+        RectComponent,
+        VelocityComponent,
+    )
+    from gamelib.ecs.modifiers.modifier import ModifierContainer
+    from gamelib.ecs.modifiers.speed_modifier import SpeedModifier
+    from gamelib.ecs.player import PlayerControllerComponent
+    from gamelib.ecs.rendering import RenderSurfaceComponent
+    from gamelib.ecs.timer import TimerComponent
+
+    registry = SnapshotRegistry()
+    registry.register_types(
+        ColliderComponent,
+        ParentComponent,
+        PositionBoundsComponent,
+        PositionComponent,
+        RectComponent,
+        VelocityComponent,
+        ModifierContainer,
+        SpeedModifier,
+        PlayerControllerComponent,
+        RenderSurfaceComponent,
+        TimerComponent,
+    )
+    return registry
+
+
+class _ComponentRef:
+    """Placeholder for a value that is another component of the same entity."""
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+
+class _Encoder:
+    def __init__(self, registry: SnapshotRegistry):
+        self.registry = registry
+        self.body = bytearray()
+        self.strings: dict[str, int] = {}
+        self.schemas: dict[tuple[type, tuple[str, ...]], int] = {}
+        self.schema_table: list[tuple[int, tuple[int, ...]]] = []
+        self.entity_components: dict[int, int] = {}
+
+    def string(self, value: str) -> int:
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    def schema(self, obj: Any) -> tuple[int, tuple[str, ...]]:
+        cls = type(obj)
+        fields = tuple(vars(obj))
+        key = (cls, fields)
+        index = self.schemas.get(key)
+        if index is None:
+            type_name = self.registry.type_name(cls)
+            if type_name is None:
+                raise SnapshotError(f"Unregistered type {cls.__qualname__!r}")
+            index = self.schemas[key] = len(self.schema_table)
+            self.schema_table.append(
+                (self.string(type_name), tuple(self.string(f) for f in fields))
+            )
+        return index, fields
+
+    def entity(self, entity: int, components: Iterable[Any]):
+        components = list(components)
+        self.entity_components = {id(c): i for i, c in enumerate(components)}
+        self.body += _ENTITY.pack(entity, len(components))
+        for component in components:
+            self.object(component)
+
+    def object(self, obj: Any):
+        index, fields = self.schema(obj)
+        self.body += _U32.pack(index)
+        attributes = vars(obj)
+        for field in fields:
+            self.value(attributes[field])
+
+    def value(self, value: Any):
+        body = self.body
+        value_type = type(value)
+        # Most component fields are numbers and strings; test those first
+        if value_type is int and _INT64_MIN <= value <= _INT64_MAX:
+            body += _TAGGED_INT.pack(TAG_INT, value)
+        elif value_type is float:
+            body += _TAGGED_FLOAT.pack(TAG_FLOAT, value)
+        elif value_type is str:
+            body += _TAGGED_U32.pack(TAG_STR, self.string(value))
+        elif value is None:
+            body += _CONSTANTS[TAG_NONE]
+        elif value is True:
+            body += _CONSTANTS[TAG_TRUE]
+        elif value is False:
+            body += _CONSTANTS[TAG_FALSE]
+        elif value_type in _SEQUENCE_TAGS:
+            body += _TAGGED_U32.pack(_SEQUENCE_TAGS[value_type], len(value))
+            for item in value:
+                self.value(item)
+        elif (name := self.registry.ref_name(value)) is not None:
+            body += _TAGGED_U32.pack(TAG_REF, self.string(name))
+        elif id(value) in self.entity_components:
+            body += _TAGGED_U32.pack(TAG_COMPONENT, self.entity_components[id(value)])
+        elif value_type is functools.partial:
+            self.partial(value)
+        elif value_type is pygame.Rect:
+            body += _TAGGED_RECT.pack(TAG_RECT, value.x, value.y, value.w, value.h)
+        elif isinstance(value, pygame.Surface):
+            body += _CONSTANTS[TAG_SURFACE]
+            self.pixels(value)
+        elif isinstance(value, pygame.mask.Mask):
+            body += _CONSTANTS[TAG_MASK]
+            surface = value.to_surface(setcolor=(255, 255, 255), unsetcolor=(0, 0, 0))
+            self.pixels(surface)
+        elif callable(value):
+            raise SnapshotError(f"Unregistered callable {value!r}")
+        else:
+            body += _CONSTANTS[TAG_OBJECT]
+            self.object(value)
+
+    def partial(self, value: functools.partial):
+        name = self.registry.ref_name(value.func)
+        if name is None or value.keywords:
+            raise SnapshotError(f"Unregistered callable {value!r}")
+        self.body += _TAGGED_U32.pack(TAG_PARTIAL, self.string(name))
+        self.value(value.args)
+
+    def pixels(self, surface: pygame.Surface):
+        data = pygame.image.tobytes(surface, "RGBA")
+        self.body += _SIZE.pack(*surface.get_size())
+        self.body += data
+
+    def finish(self, entity_count: int) -> bytes:
+        out = bytearray(_HEADER.pack(MAGIC, VERSION))
+        out += _U32.pack(len(self.strings))
+        for value in self.strings:
+            encoded = value.encode()
+            out += _U16.pack(len(encoded))
+            out += encoded
+        out += _U32.pack(len(self.schema_table))
+        for type_index, field_indices in self.schema_table:
+            out += _U32.pack(type_index)
+            out += _U16.pack(len(field_indices))
+            for field_index in field_indices:
+                out += _U32.pack(field_index)
+        out += _U32.pack(entity_count)
+        out += self.body
+        return bytes(out)
+
+
+class _Decoder:
+    def __init__(self, data: bytes, registry: SnapshotRegistry):
+        self.data = memoryview(data)
+        self.registry = registry
+        self.offset = 0
+        self.strings: list[str] = []
+        self.schemas: list[tuple[type, tuple[str, ...]]] = []
+        self.fixups: list[tuple[Any, str, int]] = []
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def header(self) -> int:
+        magic, version = self.unpack(_HEADER)
+        if magic != MAGIC or version != VERSION:
+            raise SnapshotError("Not a supported world snapshot")
+
+        (string_count,) = self.unpack(_U32)
+        for _ in range(string_count):
+            (length,) = self.unpack(_U16)
+            self.strings.append(
+                str(self.data[self.offset : self.offset + length], "utf-8")
+            )
+            self.offset += length
+
+        (schema_count,) = self.unpack(_U32)
+        for _ in range(schema_count):
+            (type_index,) = self.unpack(_U32)
+            (field_count,) = self.unpack(_U16)
+            fields = tuple(
+                self.strings[self.unpack(_U32)[0]] for _ in range(field_count)
+            )
+            self.schemas.append(
+                (self.registry.type_for(self.strings[type_index]), fields)
+            )
+
+        (entity_count,) = self.unpack(_U32)
+        return entity_count
+
+    def entity(self) -> tuple[int, list[Any]]:
+        entity, component_count = self.unpack(_ENTITY)
+        components = [self.object() for _ in range(component_count)]
+        if self.fixups:
+            for obj, field, index in self.fixups:
+                setattr(obj, field, components[index])
+            self.fixups.clear()
+        return entity, components
+
+    def object(self) -> Any:
+        (schema_index,) = self.unpack(_U32)
+        cls, fields = self.schemas[schema_index]
+        obj = cls.__new__(cls)
+        attributes = obj.__dict__
+        for field in fields:
+            value = self.value()
+            if type(value) is _ComponentRef:
+                self.fixups.append((obj, field, value.index))
+            attributes[field] = value
+        return obj
+
+    def value(self) -> Any:
+        tag = self.data[self.offset]
+        self.offset += 1
+        if tag == TAG_INT:
+            value = _I64.unpack_from(self.data, self.offset)[0]
+            self.offset += 8
+            return value
+        if tag == TAG_FLOAT:
+            value = _F64.unpack_from(self.data, self.offset)[0]
+            self.offset += 8
+            return value
+        if tag == TAG_STR:
+            value = self.strings[_U32.unpack_from(self.data, self.offset)[0]]
+            self.offset += 4
+            return value
+        if tag == TAG_NONE:
+            return None
+        if tag == TAG_FALSE:
+            return False
+        if tag == TAG_TRUE:
+            return True
+        if tag in _SEQUENCE_TYPES:
+            (length,) = self.unpack(_U32)
+            return _SEQUENCE_TYPES[tag]([self.value() for _ in range(length)])
+        if tag == TAG_REF:
+            return self.registry.ref_for(self.strings[self.unpack(_U32)[0]])
+        if tag == TAG_COMPONENT:
+            return _ComponentRef(self.unpack(_U32)[0])
+        if tag == TAG_PARTIAL:
+            func = self.registry.ref_for(self.strings[self.unpack(_U32)[0]])
+            return functools.partial(func, *self.value())
+        if tag == TAG_RECT:
+            return pygame.Rect(*self.unpack(_RECT))
+        if tag == TAG_SURFACE:
+            surface = self.pixels()
+            return surface.convert_alpha() if pygame.display.get_surface() else surface
+        if tag == TAG_MASK:
+            return pygame.mask.from_threshold(
+                self.pixels(), (255, 255, 255, 255), (1, 1, 1, 255)
+            )
+        if tag == TAG_OBJECT:
+            return self.object()
+        raise SnapshotError(f"Unknown value tag {tag}")
+
+    def pixels(self) -> pygame.Surface:
+        width, height = self.unpack(_SIZE)
+        length = width * height * 4
+        data = bytes(self.data[self.offset : self.offset + length])
+        self.offset += length
+        return pygame.image.frombytes(data, (width, height), "RGBA")
+
+
+def save_world(registry: SnapshotRegistry, path: Optional[str] = None) -> bytes:
+    """Serialize every live entity of the current world.
+
+    Args:
+        registry: Types and references the world's components use
+        path: Optional file to write the snapshot to
+
+    Returns:
+        The snapshot bytes
+    """
+    encoder = _Encoder(registry)
+    dead_entities = esper._dead_entities
+    count = 0
+    for entity, components in esper._entities.items():
+        if entity in dead_entities:
+            continue
+        encoder.entity(entity, components.values())
+        count += 1
+    data = encoder.finish(count)
+    if path is not None:
+        with open(path, "wb") as snapshot_file:
+            snapshot_file.write(data)
+    return data
+
+
+def load_snapshot(
+    data: bytes, registry: SnapshotRegistry
+) -> list[tuple[int, list[Any]]]:
+    """Decode a snapshot into (entity, components) pairs without touching esper."""
+    decoder = _Decoder(data, registry)
+    entity_count = decoder.header()
+    return [decoder.entity() for _ in range(entity_count)]
+
+
+def restore_world(data: bytes, registry: SnapshotRegistry) -> int:
+    """Replace the current world's entities with those of a snapshot.
+
+    Processors are kept and entity IDs are preserved. Components are
+    written to the entity store directly so the query cache is cleared
+    once rather than per component.
+
+    Returns:
+        The number of restored entities
+    """
+    entities = load_snapshot(data, registry)
+
+    clear_world()
+    entity_db = esper._entities
+    component_db = esper._components
+    for entity, components in entities:
+        entity_components = entity_db[entity] = {}
+        for component in components:
+            component_type = type(component)
+            entity_components[component_type] = component
+            # Restored components count as changed for change queries
+            if is_tracked(component_type):
+                changes(component_type).add(entity)
+            entity_set = component_db.get(component_type)
+            if entity_set is None:
+                entity_set = component_db[component_type] = set()
+            entity_set.add(entity)
+
+    sync_entity_counter()
+    esper.clear_cache()
+    return len(entities)
+
+
+def restore_world_from_file(path: str, registry: SnapshotRegistry) -> int:
+    with open(path, "rb") as snapshot_file:
+        return restore_world(snapshot_file.read(), registry)
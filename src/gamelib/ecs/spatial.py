@@ -0,0 +1,366 @@
+import heapq
+from dataclasses import dataclass
+from math import hypot, inf
+from typing import Iterator, Optional, Tuple
+
+import esper
+import pygame
+
+from gamelib.ecs.collision import ColliderComponent
+from gamelib.ecs.geometry import PositionComponent
+from gamelib.ecs.tracking import ChangeQuery
+
+
+@dataclass
+class RaycastHit:
+    entity: int
+    point: Tuple[float, float]
+    distance: float
+
+
+class _Entry:
+    __slots__ = ("collider", "cells", "left", "top", "right", "bottom")
+
+    def __init__(self, collider: ColliderComponent):
+        self.collider = collider
+        self.cells: Tuple[int, int, int, int] = (0, 0, -1, -1)
+        self.left = self.top = self.right = self.bottom = 0.0
+
+
+class SpatialIndex:
+    """Uniform grid of collider rects for neighbourhood queries.
+
+    Entities are bucketed into every cell their rect overlaps. update()
+    only looks at entities whose position or collider changed since the
+    previous update, and only moves them between buckets when their cell
+    range changes.
+
+    Queries only visit the cells around the query shape. Distances are
+    measured to the closest point of an entity's rect.
+    """
+
+    def __init__(self, cell_size: int = 64):
+        self.cell_size = cell_size
+        self._cells: dict[Tuple[int, int], set[int]] = {}
+        self._entries: dict[int, _Entry] = {}
+        self._moved = ChangeQuery(PositionComponent)
+        self._reshaped = ChangeQuery(ColliderComponent)
+        # Occupied cells per grid column and row, for the occupied extent
+        self._columns: dict[int, int] = {}
+        self._rows: dict[int, int] = {}
+        self._extent: Optional[Tuple[int, int, int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, entity: int) -> bool:
+        return entity in self._entries
+
+    def update(self):
+        """Sync the index with the current world's colliders."""
+        entries = self._entries
+        live = esper._components.get(ColliderComponent, ())
+        for entity in entries.keys() - live:
+            self._unlink(entity, entries.pop(entity))
+
+        dirty = {entity for entity, _ in self._moved.changed()}
+        dirty.update(entity for entity, _ in self._reshaped.changed())
+        size = self.cell_size
+        for entity in dirty:
+            collider = esper.try_component(entity, ColliderComponent)
+            position = esper.try_component(entity, PositionComponent)
+            entry = entries.get(entity)
+            if collider is None or position is None:
+                if entry is not None:
+                    self._unlink(entity, entries.pop(entity))
+                continue
+            if entry is None or entry.collider is not collider:
+                if entry is not None:
+                    self._unlink(entity, entry)
+                entry = entries[entity] = _Entry(collider)
+            left = position.x + collider.offset_x
+            top = position.y + collider.offset_y
+            right = left + collider.width
+            bottom = top + collider.height
+            entry.left, entry.top, entry.right, entry.bottom = left, top, right, bottom
+            cells = (
+                int(left // size),
+                int(top // size),
+                int(right // size),
+                int(bottom // size),
+            )
+            if cells != entry.cells:
+                self._unlink(entity, entry)
+                entry.cells = cells
+                self._link(entity, entry)
+
+    def clear(self):
+        self._cells.clear()
+        self._entries.clear()
+        self._moved.reset()
+        self._reshaped.reset()
+        self._columns.clear()
+        self._rows.clear()
+        self._extent = None
+
+    def query_rect(self, rect: pygame.Rect, tag: Optional[str] = None) -> list[int]:
+        """Entities whose rect overlaps rect."""
+        found = []
+        for entity in self._candidates(rect.left, rect.top, rect.right, rect.bottom):
+            entry = self._entries[entity]
+            if (tag is None or tag in entry.collider.tags) and (
+                entry.left < rect.right
+                and rect.left < entry.right
+                and entry.top < rect.bottom
+                and rect.top < entry.bottom
+            ):
+                found.append(entity)
+        return found
+
+    def query_radius(
+        self, x: float, y: float, radius: float, tag: Optional[str] = None
+    ) -> list[int]:
+        """Entities within radius of (x, y)."""
+        found = []
+        for entity in self._candidates(x - radius, y - radius, x + radius, y + radius):
+            entry = self._entries[entity]
+            if tag is None or tag in entry.collider.tags:
+                if _distance_to(entry, x, y) <= radius:
+                    found.append(entity)
+        return found
+
+    def nearest(
+        self,
+        x: float,
+        y: float,
+        k: int = 1,
+        tag: Optional[str] = None,
+        max_distance: float = inf,
+    ) -> list[int]:
+        """The k entities closest to (x, y), closest first.
+
+        Searches rings of cells around the point until no unvisited cell can
+        hold anything closer than the k-th entity found.
+        """
+        extent = self._occupied_extent()
+        if extent is None or k <= 0:
+            return []
+        size = self.cell_size
+        cx, cy = int(x // size), int(y // size)
+        max_ring = max(
+            cx - extent[0], extent[2] - cx, cy - extent[1], extent[3] - cy, 0
+        )
+        seen: set[int] = set()
+        found: list[Tuple[float, int]] = []
+        for ring in range(max_ring + 1):
+            # Cells of this ring and beyond are at least this far away
+            if ring and ring * size - size > max_distance:
+                break
+            for cell in _ring_cells(cx, cy, ring):
+                for entity in self._cells.get(cell, ()):
+                    if entity in seen:
+                        continue
+                    seen.add(entity)
+                    entry = self._entries[entity]
+                    if tag is not None and tag not in entry.collider.tags:
+                        continue
+                    distance = _distance_to(entry, x, y)
+                    if distance <= max_distance:
+                        found.append((distance, entity))
+            if len(found) >= k and heapq.nsmallest(k, found)[-1][0] <= ring * size:
+                break
+        return [entity for _, entity in heapq.nsmallest(k, found)]
+
+    def raycast(
+        self,
+        start: Tuple[float, float],
+        end: Tuple[float, float],
+        tag: Optional[str] = None,
+        ignore: Optional[int] = None,
+    ) -> Optional[RaycastHit]:
+        """First entity hit by the segment from start to end.
+
+        Walks the grid cells along the segment and stops at the first cell
+        past which no closer hit is possible.
+        """
+        x0, y0 = start
+        x1, y1 = end
+        dx, dy = x1 - x0, y1 - y0
+        length = hypot(dx, dy)
+        size = self.cell_size
+        cx, cy = int(x0 // size), int(y0 // size)
+        end_cell = (int(x1 // size), int(y1 // size))
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        # Segment parameter t (0 at start, 1 at end) of the next cell borders
+        t_max_x = ((cx + (dx > 0)) * size - x0) / dx if dx else inf
+        t_max_y = ((cy + (dy > 0)) * size - y0) / dy if dy else inf
+        t_delta_x = size / abs(dx) if dx else inf
+        t_delta_y = size / abs(dy) if dy else inf
+
+        tested: set[int] = set()
+        best_t = inf
+        best_entity = None
+        while True:
+            for entity in self._cells.get((cx, cy), ()):
+                if entity in tested or entity == ignore:
+                    continue
+                tested.add(entity)
+                entry = self._entries[entity]
+                if tag is not None and tag not in entry.collider.tags:
+                    continue
+                t = _clip_segment(entry, x0, y0, dx, dy)
+                if t is not None and t < best_t:
+                    best_t, best_entity = t, entity
+            t_next = min(t_max_x, t_max_y)
+            # Stop at the end of the segment, or once the hit lies before
+            # the next cell border
+            if (cx, cy) == end_cell or t_next > 1 or best_t <= t_next:
+                break
+            if t_max_x < t_max_y:
+                cx += step_x
+                t_max_x += t_delta_x
+            else:
+                cy += step_y
+                t_max_y += t_delta_y
+
+        if best_entity is None:
+            return None
+        return RaycastHit(
+            best_entity, (x0 + dx * best_t, y0 + dy * best_t), best_t * length
+        )
+
+    def _candidates(
+        self, left: float, top: float, right: float, bottom: float
+    ) -> Iterator[int]:
+        size = self.cell_size
+        cells = self._cells
+        seen: set[int] = set()
+        for cx in range(int(left // size), int(right // size) + 1):
+            for cy in range(int(top // size), int(bottom // size) + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    for entity in bucket:
+                        if entity not in seen:
+                            seen.add(entity)
+                            yield entity
+
+    def _occupied_extent(self) -> Optional[Tuple[int, int, int, int]]:
+        # Recomputed from the columns and rows, not the cells, once a cell
+        # on the border was emptied
+        if self._extent is None and self._columns:
+            columns, rows = self._columns, self._rows
+            self._extent = (min(columns), min(rows), max(columns), max(rows))
+        return self._extent
+
+    def _cell_added(self, cx: int, cy: int):
+        self._columns[cx] = self._columns.get(cx, 0) + 1
+        self._rows[cy] = self._rows.get(cy, 0) + 1
+        extent = self._extent
+        if extent is not None:
+            self._extent = (
+                min(extent[0], cx),
+                min(extent[1], cy),
+                max(extent[2], cx),
+                max(extent[3], cy),
+            )
+
+    def _cell_removed(self, cx: int, cy: int):
+        extent = self._extent
+        for counts, key, low, high in (
+            (self._columns, cx, 0, 2),
+            (self._rows, cy, 1, 3),
+        ):
+            count = counts[key] - 1
+            if count:
+                counts[key] = count
+                continue
+            del counts[key]
+            if extent is not None and key in (extent[low], extent[high]):
+                self._extent = None
+
+    def _link(self, entity: int, entry: _Entry):
+        left, top, right, bottom = entry.cells
+        cells = self._cells
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    bucket = cells[(cx, cy)] = set()
+                    self._cell_added(cx, cy)
+                bucket.add(entity)
+
+    def _unlink(self, entity: int, entry: _Entry):
+        left, top, right, bottom = entry.cells
+        cells = self._cells
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(entity)
+                    if not bucket:
+                        del cells[(cx, cy)]
+                        self._cell_removed(cx, cy)
+
+
+def _distance_to(entry: _Entry, x: float, y: float) -> float:
+    dx = max(entry.left - x, 0.0, x - entry.right)
+    dy = max(entry.top - y, 0.0, y - entry.bottom)
+    return hypot(dx, dy)
+
+
+def _clip_segment(
+    entry: _Entry, x0: float, y0: float, dx: float, dy: float
+) -> Optional[float]:
+    """Segment parameter where the segment enters the rect (slab test)."""
+    t_enter, t_exit = 0.0, 1.0
+    for origin, delta, low, high in (
+        (x0, dx, entry.left, entry.right),
+        (y0, dy, entry.top, entry.bottom),
+    ):
+        if delta == 0:
+            if origin < low or origin > high:
+                return None
+            continue
+        t0 = (low - origin) / delta
+        t1 = (high - origin) / delta
+        if t0 > t1:
+            t0, t1 = t1, t0
+        t_enter = max(t_enter, t0)
+        t_exit = min(t_exit, t1)
+        if t_enter > t_exit:
+            return None
+    return t_enter
+
+
+def _ring_cells(cx: int, cy: int, ring: int) -> Iterator[Tuple[int, int]]:
+    if ring == 0:
+        yield cx, cy
+        return
+    for x in range(cx - ring, cx + ring + 1):
+        yield x, cy - ring
+        yield x, cy + ring
+    for y in range(cy - ring + 1, cy + ring):
+        yield cx - ring, y
+        yield cx + ring, y
+
+
+class SpatialIndexProcessor(esper.Processor):
+    """Keeps a SpatialIndex in sync with the world once per frame.
+
+    Add it after the movement processors and before anything that queries
+    it, so every system sees the same index within a frame:
+
+        esper.add_processor(SpatialIndexProcessor(), priority=96)
+        index = esper.get_processor(SpatialIndexProcessor).index
+        targets = index.nearest(x, y, k=3, tag="enemy")
+
+    Positions changed later in the frame are picked up on the next frame.
+    """
+
+    def __init__(self, cell_size: int = 64):
+        super().__init__()
+        self.index = SpatialIndex(cell_size)
+
+    def process(self, dt):
+        self.index.update()
@@ -0,0 +1,74 @@
+from typing import Any, Callable, Iterable, Sequence, Tuple
+
+import esper
+
+from gamelib.ecs.collision import ColliderComponent
+from gamelib.ecs.geometry import PositionComponent
+
+
+def create_entities(component_lists: Iterable[Iterable[Any]]) -> list[int]:
+    """Create one entity per component list with a single cache invalidation.
+
+    Equivalent to calling esper.create_entity(*components) for each list,
+    but components are written to the current world's entity store
+    directly and the query cache is cleared once at the end instead of once
+    per component.
+
+    Returns:
+        The new entity IDs, in order
+    """
+    entity_db = esper._entities
+    component_db = esper._components
+    entity_count = esper._entity_count
+    created = []
+    for components in component_lists:
+        entity = next(entity_count)
+        entity_components = entity_db.setdefault(entity, {})
+        for component in components:
+            component_type = type(component)
+            entity_components[component_type] = component
+            entities = component_db.get(component_type)
+            if entities is None:
+                entities = component_db[component_type] = set()
+            entities.add(entity)
+        created.append(entity)
+    esper.clear_cache()
+    return created
+
+
+def with_position(components: Iterable[Any], position: Tuple[int, int]) -> list[Any]:
+    """Return components with their PositionComponent set to position.
+
+    A PositionComponent is appended if the list doesn't have one. Colliders
+    are placed there too, so fast ones sweep their first movement.
+    """
+    components = list(components)
+    for component in components:
+        if type(component) is PositionComponent:
+            component.x, component.y = position
+            break
+    else:
+        component = PositionComponent(position[0], position[1])
+        components.append(component)
+    for collider in components:
+        if isinstance(collider, ColliderComponent):
+            collider.spawn_at(component)
+    return components
+
+
+def spawn_batch(
+    template: Callable[[], Iterable[Any]], positions: Sequence[Tuple[int, int]]
+) -> list[int]:
+    """Create an entity at each position from a component template.
+
+    Args:
+        template: Called once per entity; must return fresh component
+            instances (e.g. a prefab's components property)
+        positions: Spawn position of each entity
+
+    Returns:
+        The new entity IDs, in the order of positions
+    """
+    return create_entities(
+        with_position(template(), position) for position in positions
+    )
@@ -0,0 +1,142 @@
+"""Change tracking for components.
+
+Processors that write a @tracked component type record the entities they
+changed in the type's dirty set; a ChangeQuery remembers the version of
+its previous run and yields the components changed or added since then,
+so a processor can skip the work for entities that didn't change:
+
+    @tracked
+    @dataclass
+    class PositionComponent:
+        x: int
+        y: int
+
+    # Writer
+    def process(self, dt):
+        moved = changes(PositionComponent)
+        for entity, (velocity, position) in esper.get_components(...):
+            position.x += velocity.x
+            moved.add(entity)
+
+    # Reader
+    moved = ChangeQuery(PositionComponent)
+
+    def process(self, dt):
+        for entity, position in moved.changed():
+            ...
+
+Writes are plain attribute writes; tracking costs one set insertion per
+changed entity. Components added to the world count as changed without
+being marked. Replacing an entity's component with add_component() or
+writing a field without marking it goes unnoticed.
+"""
+
+from collections import deque
+from typing import Any, Iterator, Tuple
+
+import esper
+
+# Versions of dirty sets kept per component type; a query that falls
+# further behind treats every component as changed
+MAX_VERSIONS = 256
+
+_version = 1
+# World name -> component type -> (version, dirty entities), oldest first
+_logs: dict[str, dict[type, deque[Tuple[int, set[int]]]]] = {}
+
+
+def tracked(cls: type) -> type:
+    """Class decorator declaring that writers of the type mark changes."""
+    cls.__tracked__ = True
+    return cls
+
+
+def is_tracked(cls: type) -> bool:
+    return getattr(cls, "__tracked__", False)
+
+
+def _log(component_type: type) -> deque[Tuple[int, set[int]]]:
+    world_logs = _logs.get(esper.current_world)
+    if world_logs is None:
+        world_logs = _logs[esper.current_world] = {}
+    log = world_logs.get(component_type)
+    if log is None:
+        log = world_logs[component_type] = deque(maxlen=MAX_VERSIONS)
+    return log
+
+
+def changes(component_type: type) -> set[int]:
+    """The current world's set of entities changed in this version.
+
+    Writers fetch it once per pass and add the entities whose component
+    of component_type they changed.
+    """
+    log = _log(component_type)
+    if not log or log[-1][0] != _version:
+        log.append((_version, set()))
+    return log[-1][1]
+
+
+def mark_changed(entity: int, component_type: type):
+    """Flag an entity's component as changed."""
+    changes(component_type).add(entity)
+
+
+def next_version() -> int:
+    """Start a new change version and return it.
+
+    Changes marked before the call belong to a lower version than the
+    returned one, changes marked afterwards to the same.
+    """
+    global _version
+    _version += 1
+    return _version
+
+
+class ChangeQuery:
+    """Yields the components of one type changed since the previous call.
+
+    The first call yields every component. Each processor should own its
+    query, since calling it consumes the changes for that query only.
+    """
+
+    def __init__(self, component_type: type):
+        if not is_tracked(component_type):
+            raise TypeError(f"{component_type.__qualname__} is not @tracked")
+        self.component_type = component_type
+        self._cursor = 0
+        self._known: set[int] = set()
+
+    def reset(self):
+        """Make the next call yield every component again."""
+        self._cursor = 0
+        self._known = set()
+
+    def skip(self):
+        """Treat everything changed so far as seen, e.g. own writes."""
+        self._cursor = next_version()
+
+    def changed(self) -> Iterator[Tuple[int, Any]]:
+        component_type = self.component_type
+        since = self._cursor
+        self._cursor = next_version()
+        live = esper._components.get(component_type, set())
+        # Snapshot, since the caller may add or remove components while
+        # iterating
+        known = set(live)
+
+        log = _log(component_type)
+        if since == 0 or (len(log) == log.maxlen and log[0][0] > since):
+            dirty = known
+        else:
+            dirty = known - self._known
+            for version, entities in reversed(log):
+                if version < since:
+                    break
+                dirty |= entities
+        self._known = known
+
+        entity_db = esper._entities
+        for entity in dirty:
+            if entity in live:
+                yield entity, entity_db[entity][component_type]
@@ -0,0 +1,51 @@
+import itertools
+
+import esper
+
+from gamelib.ecs.entities import EntityAllocator
+
+
+def _store_entity_counter():
+    # esper keeps each world's state in a tuple in _context_map that is
+    # reloaded by switch_world(); a rebound counter has to be put back
+    # there or switching away and back revives the old one, which hands
+    # out IDs of live entities again.
+    context = esper._context_map[esper.current_world]
+    esper._context_map[esper.current_world] = (esper._entity_count, *context[1:])
+
+
+def clear_world():
+    """esper.clear_database() that is safe to use with several worlds.
+
+    Keeps the world's EntityAllocator, if it has one.
+    """
+    counter = esper._entity_count
+    esper.clear_database()
+    if isinstance(counter, EntityAllocator):
+        counter.clear()
+        esper._entity_count = counter
+    _store_entity_counter()
+
+
+def use_entity_allocator() -> EntityAllocator:
+    """Make the current world recycle entity IDs (see gamelib.ecs.entities)."""
+    counter = esper._entity_count
+    if not isinstance(counter, EntityAllocator):
+        counter = EntityAllocator(esper._entities)
+        counter.rebuild()
+        esper._entity_count = counter
+        _store_entity_counter()
+    return counter
+
+
+def sync_entity_counter():
+    """Continue entity IDs after the entities now in the current world.
+
+    For entity stores filled directly, e.g. when restoring a snapshot.
+    """
+    counter = esper._entity_count
+    if isinstance(counter, EntityAllocator):
+        counter.rebuild()
+        return
+    esper._entity_count = itertools.count(start=max(esper._entities, default=0) + 1)
+    _store_entity_counter()
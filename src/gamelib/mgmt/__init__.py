@@ -1,3 +1,9 @@
-from .game_event import GameEvent
-from .game_mixer import GameMixer
+from .frame_governor import DegradationStep, FrameGovernor, QualityAdjustment
+from .frame_pacer import FrameHistogram, FramePacer
+from .game_event import EVENT_BUS, EventBus, EventStats, GameEvent, ListenerScope
+from .game_mixer import GameMixer, MixerStats, SoundPolicy
+from .gc_controller import GcController, GcFrameStats
+from .render_thread import RenderCanvas, RenderThread
 from .scene_base import SceneBase
+from .scene_manager import SceneManager
+from .sound_bank import SoundBank
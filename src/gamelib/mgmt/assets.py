@@ -0,0 +1,137 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import pygame
+
+from gamelib.mgmt.startup import StartupTimer
+
+
+@dataclass
+class ImageSpec:
+    """How an image file is turned into a surface (see image_loader)."""
+
+    path: str
+    scale: float = 1
+    size: Optional[tuple[int, int]] = None
+    transparent_pixels: bool = False
+
+
+def image_loader(
+    path: str,
+    scale: float = 1,
+    size: Optional[tuple[int, int]] = None,
+    transparent_pixels: bool = False,
+) -> Callable[[], pygame.Surface]:
+    """Build a loader that decodes, converts and scales an image once.
+
+    Args:
+        path: Image file path
+        scale: Scale factor applied if size is not given
+        size: Exact target size
+        transparent_pixels: Convert with per-pixel alpha
+    """
+
+    def load() -> pygame.Surface:
+        image = pygame.image.load(path)
+        image = image.convert_alpha() if transparent_pixels else image.convert()
+        target = size or (
+            int(image.get_width() * scale),
+            int(image.get_height() * scale),
+        )
+        if target != image.get_size():
+            image = pygame.transform.scale(image, target)
+        return image
+
+    return load
+
+
+def font_loader(path: str, size: int) -> Callable[[], pygame.font.Font]:
+    return lambda: pygame.font.Font(path, size)
+
+
+class AssetStore:
+    """Named assets that are loaded once and shared.
+
+    Assets are registered with a loader callable. Accessing an asset that
+    hasn't been preloaded loads it on demand.
+    """
+
+    def __init__(self):
+        self._loaders: dict[str, Callable[[], Any]] = {}
+        self._assets: dict[str, Any] = {}
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        if name in self._loaders:
+            raise KeyError(f"Asset {name!r} is already registered")
+        self._loaders[name] = loader
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return self._assets[name]
+        except KeyError:
+            return self.load(name)
+
+    def load(self, name: str) -> Any:
+        asset = self._loaders[name]()
+        self._assets[name] = asset
+        return asset
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._assets
+
+    def names(self) -> list[str]:
+        return list(self._loaders)
+
+    def pending(self) -> list[str]:
+        """Names of registered assets that are not loaded yet."""
+        return [name for name in self._loaders if name not in self._assets]
+
+
+class AssetLoader:
+    """Loads the pending assets of a store as a cooperative asyncio task.
+
+    Assets are loaded until budget_ms is spent, then control is yielded back
+    to the event loop so the main loop can present a frame.
+
+    Usage:
+        loader = AssetLoader(assets)
+        task = asyncio.ensure_future(loader.run())
+        # ... keep running frames, show loader.progress, until task.done()
+    """
+
+    def __init__(
+        self,
+        store: AssetStore,
+        budget_ms: float = 4.0,
+        timer: Optional[StartupTimer] = None,
+    ):
+        self.store = store
+        self.budget_ms = budget_ms
+        self.timer = timer
+        self.total = 0
+        self.loaded = 0
+
+    @property
+    def progress(self) -> float:
+        return self.loaded / self.total if self.total else 0.0
+
+    async def run(self):
+        names = self.store.pending()
+        self.total = len(names)
+        decode_time = 0.0
+        slice_start = time.perf_counter()
+        for name in names:
+            start = time.perf_counter()
+            if not self.store.is_loaded(name):
+                self.store.load(name)
+            now = time.perf_counter()
+            decode_time += now - start
+            self.loaded += 1
+            if (now - slice_start) * 1000 >= self.budget_ms:
+                await asyncio.sleep(0)
+                slice_start = time.perf_counter()
+        if self.timer:
+            self.timer.add("asset decode", decode_time)
+            self.timer.mark("assets loaded")
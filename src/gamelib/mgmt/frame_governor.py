@@ -0,0 +1,136 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass
+class DegradationStep:
+    """A quality reduction the governor can apply and undo.
+
+    Attributes:
+        name: Shown in adjustment reports
+        apply: Lowers quality
+        restore: Undoes apply()
+    """
+
+    name: str
+    apply: Callable[[], None]
+    restore: Callable[[], None]
+
+
+@dataclass
+class QualityAdjustment:
+    frame: int
+    step: str
+    degraded: bool
+    average_ms: float
+
+    def __str__(self) -> str:
+        action = "degrade" if self.degraded else "restore"
+        return f"frame {self.frame}: {action} {self.step} (avg {self.average_ms:.1f}ms)"
+
+
+class FrameGovernor:
+    """Sheds load when frames overrun their budget and restores it afterwards.
+
+    Steps are applied in registration order, so register the cheapest
+    quality loss first. The governor looks at the average work time of the
+    last `window` frames: above budget * overload the next step is applied,
+    below budget * headroom the last applied step is restored. After each
+    adjustment the window is cleared, so a change is only judged on frames
+    that ran with it.
+
+    Usage:
+        governor = FrameGovernor(budget_ms=1000 / 60)
+        governor.add_step("effects", lower_effect_cap, restore_effect_cap)
+        # every frame, with the time spent updating and drawing:
+        governor.record(work_ms)
+        # on exit:
+        print(governor.report())
+    """
+
+    def __init__(
+        self,
+        budget_ms: float,
+        window: int = 30,
+        overload: float = 1.0,
+        headroom: float = 0.6,
+        on_adjust: Optional[Callable[[QualityAdjustment], None]] = None,
+    ):
+        self.budget_ms = budget_ms
+        self.overload = overload
+        self.headroom = headroom
+        self.on_adjust = on_adjust
+        self.steps: list[DegradationStep] = []
+        self.level = 0
+        self.frame = 0
+        self.adjustments: list[QualityAdjustment] = []
+        self._samples: deque[float] = deque(maxlen=window)
+        self._total = 0.0
+
+    def add_step(
+        self, name: str, apply: Callable[[], None], restore: Callable[[], None]
+    ) -> DegradationStep:
+        step = DegradationStep(name, apply, restore)
+        self.steps.append(step)
+        return step
+
+    @property
+    def average_ms(self) -> float:
+        return self._total / len(self._samples) if self._samples else 0.0
+
+    def record(self, frame_ms: float) -> Optional[QualityAdjustment]:
+        """Add a frame's work time and adjust quality if needed.
+
+        Returns:
+            The adjustment made for this frame, if any
+        """
+        self.frame += 1
+        samples = self._samples
+        if len(samples) == samples.maxlen:
+            self._total -= samples[0]
+        samples.append(frame_ms)
+        self._total += frame_ms
+        if len(samples) < samples.maxlen:
+            return None
+
+        average = self._total / len(samples)
+        if average > self.budget_ms * self.overload:
+            if self.level < len(self.steps):
+                step = self.steps[self.level]
+                step.apply()
+                self.level += 1
+                return self._adjusted(step, True, average)
+        elif average < self.budget_ms * self.headroom and self.level > 0:
+            self.level -= 1
+            step = self.steps[self.level]
+            step.restore()
+            return self._adjusted(step, False, average)
+        return None
+
+    def restore_all(self):
+        """Undo every applied step, e.g. when the workload changes entirely."""
+        while self.level > 0:
+            self.level -= 1
+            step = self.steps[self.level]
+            step.restore()
+            self._adjusted(step, False, self.average_ms)
+
+    def report(self) -> str:
+        lines = [
+            f"Quality: {len(self.adjustments)} adjustments, "
+            f"{self.level} of {len(self.steps)} steps applied"
+        ]
+        lines.extend(f"  {adjustment}" for adjustment in self.adjustments)
+        return "\n".join(lines)
+
+    def _adjusted(
+        self, step: DegradationStep, degraded: bool, average: float
+    ) -> QualityAdjustment:
+        adjustment = QualityAdjustment(self.frame, step.name, degraded, average)
+        self.adjustments.append(adjustment)
+        self._samples.clear()
+        self._total = 0.0
+        if self.on_adjust:
+            self.on_adjust(adjustment)
+        return adjustment
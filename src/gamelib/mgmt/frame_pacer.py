@@ -0,0 +1,170 @@
+import asyncio
+import json
+import time
+from typing import Optional
+
+UNCAPPED = "uncapped"
+FIXED = "fixed"
+VSYNC = "vsync"
+
+# Frames in a row finishing in under half a period after which vsync is
+# considered unavailable
+VSYNC_PROBE_FRAMES = 30
+
+
+class FrameHistogram:
+    """Frame intervals counted in fixed-width buckets.
+
+    Intervals above max_ms land in the last bucket.
+    """
+
+    def __init__(self, bucket_ms: float = 0.25, max_ms: float = 250.0):
+        self.bucket_ms = bucket_ms
+        self.counts = [0] * (int(max_ms / bucket_ms) + 1)
+        self.total = 0
+        self.missed = 0
+        self.worst_ms = 0.0
+
+    def add(self, interval_ms: float, missed: bool = False):
+        index = min(int(interval_ms / self.bucket_ms), len(self.counts) - 1)
+        self.counts[index] += 1
+        self.total += 1
+        if missed:
+            self.missed += 1
+        if interval_ms > self.worst_ms:
+            self.worst_ms = interval_ms
+
+    def percentile(self, p: float) -> float:
+        """Upper edge of the bucket holding the p-th percentile, in ms."""
+        if not self.total:
+            return 0.0
+        rank = p / 100 * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return (index + 1) * self.bucket_ms
+        return len(self.counts) * self.bucket_ms
+
+    def clear(self):
+        self.counts = [0] * len(self.counts)
+        self.total = 0
+        self.missed = 0
+        self.worst_ms = 0.0
+
+    def summary(self) -> dict:
+        return {
+            "frames": self.total,
+            "missed": self.missed,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "worst_ms": round(self.worst_ms, 3),
+        }
+
+
+class FramePacer:
+    """Paces the main loop to a target frame rate and records the jitter.
+
+    Modes:
+        fixed: sleep until close to the deadline, then spin for the last
+            spin_ms for precise wakeups
+        vsync: the display flip blocks on vblank, so only measure; falls
+            back to fixed if VSYNC_PROBE_FRAMES frames in a row take less
+            than half a period, i.e. the flip doesn't block
+        uncapped: never wait, only measure
+
+    Deadlines advance by one period per frame; a frame that wakes up more
+    than a period late resynchronizes instead of rushing to catch up.
+    Missed deadlines are frames whose interval exceeds period * tolerance.
+
+    Usage:
+        pacer = FramePacer(60, spin_ms=1.0)
+        while running:
+            dt = await pacer.wait()
+            ...
+        print(pacer.report())
+    """
+
+    def __init__(
+        self,
+        fps: int,
+        mode: str = FIXED,
+        spin_ms: float = 1.0,
+        tolerance: float = 1.5,
+        histogram: Optional[FrameHistogram] = None,
+    ):
+        if mode not in (UNCAPPED, FIXED, VSYNC):
+            raise ValueError(f"Unknown pacing mode {mode!r}")
+        self.fps = fps
+        self.mode = mode
+        self.period = 1.0 / fps
+        self.spin = spin_ms / 1000
+        self.tolerance = tolerance
+        self.histogram = histogram or FrameHistogram()
+        self._last: Optional[float] = None
+        self._deadline = 0.0
+        self._short_frames = 0
+
+    async def wait(self) -> float:
+        """Wait for the next frame.
+
+        Always yields to the event loop at least once.
+
+        Returns:
+            Seconds since the previous frame started
+        """
+        if self.mode == FIXED and self._last is not None:
+            remaining = self._deadline - time.perf_counter()
+            if remaining > self.spin:
+                await asyncio.sleep(remaining - self.spin)
+            else:
+                await asyncio.sleep(0)
+            while time.perf_counter() < self._deadline:
+                pass
+        else:
+            await asyncio.sleep(0)
+
+        now = time.perf_counter()
+        if self._last is None:
+            self._last = now
+            self._deadline = now + self.period
+            return 0.0
+
+        interval = now - self._last
+        self._last = now
+        if self.mode == VSYNC:
+            self._short_frames = (
+                self._short_frames + 1 if interval < self.period / 2 else 0
+            )
+            if self._short_frames >= VSYNC_PROBE_FRAMES:
+                self.mode = FIXED
+        self._deadline += self.period
+        if now > self._deadline:
+            self._deadline = now + self.period
+        self.histogram.add(
+            interval * 1000,
+            self.mode != UNCAPPED and interval > self.period * self.tolerance,
+        )
+        return interval
+
+    def report(self) -> str:
+        stats = self.histogram.summary()
+        return (
+            f"Frame pacing ({self.mode}, {self.fps} fps): {stats['frames']} frames, "
+            f"p50 {stats['p50_ms']:.2f}ms, p95 {stats['p95_ms']:.2f}ms, "
+            f"p99 {stats['p99_ms']:.2f}ms, worst {stats['worst_ms']:.2f}ms, "
+            f"missed {stats['missed']}"
+        )
+
+    def dump(self, path: str):
+        """Write the summary and raw bucket counts as JSON."""
+        data = {
+            "mode": self.mode,
+            "fps": self.fps,
+            "bucket_ms": self.histogram.bucket_ms,
+            **self.histogram.summary(),
+            "counts": self.histogram.counts,
+        }
+        with open(path, "w") as f:
+            json.dump(data, f)
@@ -1,16 +1,197 @@
-from typing import Callable
+import inspect
+import weakref
+from dataclasses import dataclass
+from typing import Callable, Optional
 
 
-class GameEvent:
+@dataclass
+class EventStats:
+    """Dispatch counters for a single GameEvent.
+
+    Attributes:
+        triggered: Number of trigger() calls
+        delivered: Number of deliveries (one per payload, or one per batch
+            when the event coalesces)
+        listener_calls: Total number of listener invocations
+    """
+
+    triggered: int = 0
+    delivered: int = 0
+    listener_calls: int = 0
+
+
+class _StrongRef:
+    """Mimics the weakref call protocol for listeners held strongly."""
+
+    __slots__ = ("listener",)
+
+    def __init__(self, listener: Callable):
+        self.listener = listener
+
+    def __call__(self) -> Callable:
+        return self.listener
+
+
+class ListenerScope:
+    """Groups listener registrations so they can be released together.
+
+    Scenes own a scope; closing it removes every listener that was added
+    with it, so restarting a scene doesn't leave stale listeners behind.
+    Payloads already queued for the scope's events are delivered first, so
+    a scene that ends mid-frame still sees the events of its last frame.
+    """
+
+    def __init__(self):
+        self._registrations: list[tuple["GameEvent", Callable]] = []
+
+    def add(self, event: "GameEvent", listener: Callable):
+        self._registrations.append((event, listener))
+
+    def close(self):
+        for event, _ in self._registrations:
+            event.bus.deliver_pending(event)
+        for event, listener in self._registrations:
+            event.discard_listener(listener)
+        self._registrations.clear()
+
+
+class EventBus:
+    """Queues triggered events and delivers them at a defined point.
+
+    GameEvent.trigger() only records the payload; listeners run when
+    dispatch() is called, once per frame from the main loop. Payloads are
+    grouped per event, in the order each event was first triggered. Events
+    triggered by listeners during dispatch are delivered on the next call.
+    """
+
     def __init__(self):
-        self.listeners: list[Callable] = []
+        self.events: list["GameEvent"] = []
+        self._pending: dict["GameEvent", list[tuple]] = {}
 
-    def add_listener(self, listener: Callable):
-        self.listeners.append(listener)
+    def register(self, event: "GameEvent"):
+        self.events.append(event)
+
+    def enqueue(self, event: "GameEvent", args: tuple):
+        payloads = self._pending.get(event)
+        if payloads is None:
+            self._pending[event] = [args]
+        else:
+            payloads.append(args)
+
+    def dispatch(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        for event, payloads in pending.items():
+            event.deliver(payloads)
+
+    def deliver_pending(self, event: "GameEvent"):
+        """Deliver the payloads queued for one event ahead of dispatch()."""
+        payloads = self._pending.pop(event, None)
+        if payloads:
+            event.deliver(payloads)
+
+    def clear(self):
+        """Drop all queued payloads without delivering them."""
+        self._pending.clear()
+
+    @property
+    def stats(self) -> dict[str, EventStats]:
+        return {event.name: event.stats for event in self.events}
+
+
+EVENT_BUS = EventBus()
+
+
+class GameEvent:
+    """Named event whose listeners are called from the event bus.
+
+    Args:
+        name: Name used when reporting dispatch counters
+        coalesce: If True, all payloads triggered in a frame are delivered
+            to each listener as a single list of argument tuples
+        bus: EventBus to queue on (defaults to EVENT_BUS)
+    """
+
+    def __init__(
+        self, name: str = "", coalesce: bool = False, bus: Optional[EventBus] = None
+    ):
+        self.name = name
+        self.coalesce = coalesce
+        self.bus = bus or EVENT_BUS
+        self.listeners: list[Callable[[], Optional[Callable]]] = []
+        self.stats = EventStats()
+        self.bus.register(self)
+
+    def add_listener(
+        self,
+        listener: Callable,
+        weak: bool = False,
+        scope: Optional[ListenerScope] = None,
+    ):
+        """Register a listener.
+
+        Args:
+            listener: Callable receiving the trigger() arguments, or a list of
+                argument tuples if the event coalesces
+            weak: Only hold a weak reference; the listener is dropped once
+                it (or the object owning the bound method) is collected
+            scope: Optional ListenerScope that removes the listener on close
+        """
+        if weak:
+            ref = (
+                weakref.WeakMethod(listener)
+                if inspect.ismethod(listener)
+                else weakref.ref(listener)
+            )
+        else:
+            ref = _StrongRef(listener)
+        self.listeners.append(ref)
+        if scope is not None:
+            scope.add(self, listener)
 
     def remove_listener(self, listener: Callable):
-        self.listeners.remove(listener)
+        for i, ref in enumerate(self.listeners):
+            if ref() == listener:
+                del self.listeners[i]
+                return
+        raise ValueError(f"{listener!r} is not a listener of {self.name!r}")
+
+    def discard_listener(self, listener: Callable):
+        """Remove a listener if it is registered."""
+        try:
+            self.remove_listener(listener)
+        except ValueError:
+            pass
+
+    def trigger(self, *args):
+        """Queue a payload for delivery on the next bus dispatch."""
+        self.stats.triggered += 1
+        if self.listeners:
+            self.bus.enqueue(self, args)
+
+    def deliver(self, payloads: list[tuple]):
+        """Call listeners with queued payloads (normally invoked by the bus)."""
+        listeners = []
+        for ref in self.listeners:
+            listener = ref()
+            if listener is not None:
+                listeners.append(listener)
+        if len(listeners) != len(self.listeners):
+            self.listeners = [ref for ref in self.listeners if ref() is not None]
+        if not listeners:
+            return
+
+        stats = self.stats
+        if self.coalesce:
+            stats.delivered += 1
+            for listener in listeners:
+                listener(payloads)
+            stats.listener_calls += len(listeners)
+            return
 
-    def trigger(self, *args, **kwargs):
-        for listener in self.listeners:
-            listener(*args, **kwargs)
+        stats.delivered += len(payloads)
+        for args in payloads:
+            for listener in listeners:
+                listener(*args)
+        stats.listener_calls += len(payloads) * len(listeners)
@@ -1,16 +1,164 @@
+from dataclasses import dataclass
+from typing import Optional
+
 import pygame
 
 
+@dataclass
+class SoundPolicy:
+    """Playback limits for a registered sound.
+
+    Attributes:
+        max_voices: Maximum simultaneous voices (0 for unlimited). When the
+            limit is reached the oldest voice of the same sound is restarted.
+        cooldown_ms: Minimum time between two plays of the sound
+        priority: Voices may only steal channels from voices of lower or
+            equal priority
+    """
+
+    max_voices: int = 0
+    cooldown_ms: int = 0
+    priority: int = 0
+
+
+@dataclass
+class MixerStats:
+    plays: int = 0
+    drops: int = 0
+    steals: int = 0
+
+
+@dataclass
+class _Voice:
+    sound: pygame.mixer.Sound
+    priority: int
+    started: int
+
+
+DEFAULT_POLICY = SoundPolicy()
+
+
 class GameMixer:
+    """Allocates mixer channels to sounds.
+
+    Free channels are tracked from each channel's end event rather than by
+    polling every channel on play, so handle_event() must be fed the pygame
+    events from the main loop.
+    """
+
     def __init__(self):
         if not pygame.mixer.get_init():
             pygame.mixer.init()
         self.channels: list[pygame.mixer.Channel] = []
+        self.voices: list[Optional[_Voice]] = []
+        self.policies: dict[pygame.mixer.Sound, SoundPolicy] = {}
+        self.stats = MixerStats()
+        self._free: set[int] = set()
+        self._end_events: dict[int, int] = {}
+        self._last_played: dict[pygame.mixer.Sound, int] = {}
         for i in range(pygame.mixer.get_num_channels()):
-            self.channels.append(pygame.mixer.Channel(i))
+            channel = pygame.mixer.Channel(i)
+            end_event = pygame.event.custom_type()
+            channel.set_endevent(end_event)
+            self.channels.append(channel)
+            self.voices.append(None)
+            self._free.add(i)
+            self._end_events[end_event] = i
+
+    def register(
+        self,
+        sound: pygame.mixer.Sound,
+        max_voices: int = 0,
+        cooldown_ms: int = 0,
+        priority: int = 0,
+    ) -> pygame.mixer.Sound:
+        """Set the playback policy for a sound."""
+        self.policies[sound] = SoundPolicy(max_voices, cooldown_ms, priority)
+        return sound
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """Release a channel on its end event.
+
+        Returns:
+            True if the event was a channel end event (and was consumed)
+        """
+        index = self._end_events.get(event.type)
+        if index is None:
+            return False
+        # A stolen channel posts an end event for the halted sound while the
+        # new one is already playing
+        if not self.channels[index].get_busy():
+            self.voices[index] = None
+            self._free.add(index)
+        return True
+
+    def play_sound(
+        self, sound: pygame.mixer.Sound, priority: Optional[int] = None
+    ) -> Optional[pygame.mixer.Channel]:
+        """Play a sound on a free or stolen channel.
+
+        Args:
+            sound: Sound to play
+            priority: Overrides the registered priority for this play
+
+        Returns:
+            The channel playing the sound, or None if it was dropped
+        """
+        policy = self.policies.get(sound, DEFAULT_POLICY)
+        if priority is None:
+            priority = policy.priority
+        now = pygame.time.get_ticks()
+
+        if policy.cooldown_ms:
+            last_played = self._last_played.get(sound)
+            if last_played is not None and now - last_played < policy.cooldown_ms:
+                self.stats.drops += 1
+                return None
+
+        index = None
+        if policy.max_voices:
+            own_voices = [
+                i
+                for i, voice in enumerate(self.voices)
+                if voice is not None and voice.sound is sound
+            ]
+            if len(own_voices) >= policy.max_voices:
+                index = min(own_voices, key=lambda i: self.voices[i].started)
+                self.stats.steals += 1
+
+        if index is None:
+            index = self._allocate()
+        if index is None:
+            index = self._steal(priority)
+            if index is None:
+                self.stats.drops += 1
+                return None
+            self.stats.steals += 1
+
+        channel = self.channels[index]
+        channel.play(sound)
+        self.voices[index] = _Voice(sound, priority, now)
+        self._last_played[sound] = now
+        self.stats.plays += 1
+        return channel
+
+    def _allocate(self) -> Optional[int]:
+        while self._free:
+            index = self._free.pop()
+            # Channels can be taken by Sound.play() outside of the mixer; their
+            # end event puts them back in the free set
+            if not self.channels[index].get_busy():
+                return index
+        return None
 
-    def play_sound(self, sound: pygame.mixer.Sound):
-        for channel in self.channels:
-            if not channel.get_busy():
-                channel.play(sound)
-                return
+    def _steal(self, priority: int) -> Optional[int]:
+        victim = None
+        for i, voice in enumerate(self.voices):
+            if voice is None or voice.priority > priority:
+                continue
+            if victim is None or (voice.priority, voice.started) < (
+                self.voices[victim].priority,
+                self.voices[victim].started,
+            ):
+                victim = i
+        return victim
@@ -0,0 +1,133 @@
+import gc
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from gamelib.mgmt.frame_pacer import FrameHistogram
+
+
+@dataclass
+class GcFrameStats:
+    collections: int = 0
+    pause_ms: float = 0.0
+
+
+class GcController:
+    """Moves garbage collection out of frame work into frame slack.
+
+    enable() turns off automatic collection. After each frame's work,
+    collect_idle() runs a young generation collection once `threshold`
+    allocations piled up and the frame has at least min_slack_ms left,
+    escalating to older generations with the interpreter's thresholds (the
+    oldest only with full_slack_ms left). If frames never have slack, it
+    collects anyway once allocations reach force_factor times the
+    threshold, so memory can't grow without bound.
+
+    scene_changed() runs a full collection and freezes everything that
+    survives (assets, prefabs, processors), so later collections don't
+    traverse those objects again. Every collection, including ones not
+    started by the controller, is timed via gc.callbacks.
+
+    Usage:
+        gc_controller = GcController()
+        gc_controller.enable()
+        while running:
+            ...
+            gc_controller.collect_idle(budget_ms - work_ms)
+            gc_controller.end_frame()
+        print(gc_controller.report())
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[int] = None,
+        min_slack_ms: float = 2.0,
+        full_slack_ms: float = 8.0,
+        force_factor: int = 10,
+    ):
+        self.thresholds = gc.get_threshold()
+        self.threshold = threshold or self.thresholds[0]
+        self.min_slack_ms = min_slack_ms
+        self.full_slack_ms = full_slack_ms
+        self.force_factor = force_factor
+
+        self.collections = [0, 0, 0]
+        self.forced = 0
+        self.frames = 0
+        self.frames_with_collections = 0
+        self.pauses = FrameHistogram(bucket_ms=0.05, max_ms=100.0)
+        self.frame = GcFrameStats()
+        self.last_frame = GcFrameStats()
+        self._started: Optional[float] = None
+        self._was_enabled = False
+
+    def enable(self):
+        self._was_enabled = gc.isenabled()
+        gc.disable()
+        if self._on_gc not in gc.callbacks:
+            gc.callbacks.append(self._on_gc)
+
+    def disable(self):
+        """Give collection back to the interpreter."""
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        gc.unfreeze()
+        if self._was_enabled:
+            gc.enable()
+
+    def _on_gc(self, phase: str, info: dict):
+        if phase == "start":
+            self._started = time.perf_counter()
+        elif self._started is not None:
+            pause_ms = (time.perf_counter() - self._started) * 1000
+            self._started = None
+            self.collections[info["generation"]] += 1
+            self.pauses.add(pause_ms)
+            self.frame.collections += 1
+            self.frame.pause_ms += pause_ms
+
+    def collect_idle(self, slack_ms: float) -> bool:
+        """Collect if allocations piled up and the frame has time left.
+
+        Returns:
+            Whether a collection ran
+        """
+        young, collections_0, collections_1 = gc.get_count()
+        if young < self.threshold:
+            return False
+        if slack_ms < self.min_slack_ms:
+            if young < self.threshold * self.force_factor:
+                return False
+            self.forced += 1
+
+        generation = 0
+        if collections_0 >= self.thresholds[1]:
+            generation = 1
+            if collections_1 >= self.thresholds[2] and slack_ms >= self.full_slack_ms:
+                generation = 2
+        gc.collect(generation)
+        return True
+
+    def scene_changed(self):
+        """Collect everything and freeze the survivors, e.g. after loading."""
+        gc.unfreeze()
+        gc.collect()
+        gc.freeze()
+
+    def end_frame(self):
+        self.frames += 1
+        if self.frame.collections:
+            self.frames_with_collections += 1
+        self.last_frame = self.frame
+        self.frame = GcFrameStats()
+
+    def report(self) -> str:
+        return (
+            f"GC: {sum(self.collections)} collections "
+            f"(by generation {'/'.join(map(str, self.collections))}, "
+            f"{self.forced} forced) in {self.frames_with_collections} of "
+            f"{self.frames} frames, pause p50 {self.pauses.percentile(50):.2f}ms "
+            f"p99 {self.pauses.percentile(99):.2f}ms "
+            f"worst {self.pauses.worst_ms:.2f}ms, "
+            f"{gc.get_freeze_count()} objects frozen"
+        )
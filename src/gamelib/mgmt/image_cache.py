@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+from os.path import join
+from typing import Any, Callable, Optional
+
+import pygame
+
+from gamelib.mgmt.assets import ImageSpec, image_loader
+
+try:
+    import mmap
+except ImportError:  # pragma: no cover - platforms without mmap
+    mmap = None
+
+INDEX_FILE = "images.json"
+DATA_FILE = "images.bin"
+INDEX_VERSION = 2
+# Matches the pixel layout of convert_alpha() on little-endian displays,
+# so alpha sprites are used straight from the mapped file
+PIXEL_FORMAT = "BGRA"
+ALIGNMENT = 64
+
+
+def file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def file_stamp(path: str) -> list[int]:
+    """Size and modification time of a file, compared instead of its hash."""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _spec_key(spec: ImageSpec) -> list[Any]:
+    return [spec.scale, list(spec.size) if spec.size else None, spec.transparent_pixels]
+
+
+def bake_images(specs: dict[str, ImageSpec], cache_dir: str) -> int:
+    """Decode, scale and convert images into a raw pixel cache.
+
+    Writes DATA_FILE with the pixels of every image and INDEX_FILE with
+    their offsets, sizes, specs and the hashes and stamps of their sources.
+    Needs an initialized display for the conversion.
+
+    Returns:
+        The number of baked images
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    index: dict[str, Any] = {
+        "version": INDEX_VERSION,
+        "format": PIXEL_FORMAT,
+        "images": {},
+    }
+    offset = 0
+    with open(join(cache_dir, DATA_FILE), "wb") as data_file:
+        for name, spec in specs.items():
+            surface = image_loader(
+                spec.path, spec.scale, spec.size, spec.transparent_pixels
+            )()
+            pixels = pygame.image.tobytes(surface, PIXEL_FORMAT)
+            padding = -offset % ALIGNMENT
+            data_file.write(b"\0" * padding)
+            offset += padding
+            data_file.write(pixels)
+            index["images"][name] = {
+                "hash": file_hash(spec.path),
+                "stamp": file_stamp(spec.path),
+                "spec": _spec_key(spec),
+                "size": list(surface.get_size()),
+                "offset": offset,
+                "length": len(pixels),
+            }
+            offset += len(pixels)
+    with open(join(cache_dir, INDEX_FILE), "w") as index_file:
+        json.dump(index, index_file, indent=1)
+    return len(specs)
+
+
+class ImageCache:
+    """Serves baked images from a memory-mapped pixel cache.
+
+    Surfaces are created with pygame.image.frombuffer over the mapping, so
+    nothing is decoded or scaled. An image is only served if its spec and
+    the size and modification time of its source file match the baked
+    entry; otherwise get() returns None and the caller decodes the source
+    as usual.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._index: Optional[dict[str, Any]] = None
+        self._data: Optional[memoryview] = None
+
+    def _open(self) -> dict[str, Any]:
+        if self._index is None:
+            self._index = {}
+            try:
+                with open(join(self.cache_dir, INDEX_FILE)) as index_file:
+                    index = json.load(index_file)
+                if (
+                    mmap is not None
+                    and index.get("version") == INDEX_VERSION
+                    and index.get("format") == PIXEL_FORMAT
+                ):
+                    # Copy-on-write, so surfaces stay writable without
+                    # touching the file
+                    with open(join(self.cache_dir, DATA_FILE), "rb") as data_file:
+                        mapping = mmap.mmap(
+                            data_file.fileno(), 0, access=mmap.ACCESS_COPY
+                        )
+                    self._data = memoryview(mapping)
+                    self._index = index["images"]
+            except (OSError, ValueError):
+                pass
+        return self._index
+
+    def get(self, name: str, spec: ImageSpec) -> Optional[pygame.Surface]:
+        entry = self._open().get(name)
+        try:
+            valid = (
+                entry is not None
+                and entry["spec"] == _spec_key(spec)
+                and entry["stamp"] == file_stamp(spec.path)
+            )
+        except OSError:
+            valid = False
+        if not valid:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        offset = entry["offset"]
+        pixels = self._data[offset : offset + entry["length"]]
+        surface = pygame.image.frombuffer(pixels, tuple(entry["size"]), PIXEL_FORMAT)
+        if not spec.transparent_pixels:
+            # Drop the alpha channel so opaque images blit without blending
+            surface = surface.convert()
+        return surface
+
+
+def cached_image_loader(
+    cache: ImageCache, name: str, spec: ImageSpec
+) -> Callable[[], pygame.Surface]:
+    """Loader serving the baked image, decoding the source on a cache miss."""
+    fallback = image_loader(spec.path, spec.scale, spec.size, spec.transparent_pixels)
+
+    def load() -> pygame.Surface:
+        surface = cache.get(name, spec)
+        return fallback() if surface is None else surface
+
+    return load
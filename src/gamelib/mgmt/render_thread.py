@@ -0,0 +1,122 @@
+import threading
+import time
+from typing import Any, Optional, Sequence
+
+import pygame
+
+
+class RenderCanvas:
+    """Stand-in for the screen surface that records draw calls.
+
+    Scenes draw to it as to a surface (fill, blit, blits, size queries).
+    present() publishes the recorded frame as an immutable tuple of
+    commands and starts a new one; the RenderThread replays the latest
+    published frame. Only references are recorded, so surfaces passed to
+    blit must not be modified afterwards (assets, freshly rendered text).
+    """
+
+    def __init__(self, size: tuple[int, int]):
+        self._size = size
+        self._recording: list[tuple[str, tuple[Any, ...]]] = []
+        self._latest: tuple[tuple[str, tuple[Any, ...]], ...] = ()
+        self._frame = 0
+        self._published = threading.Condition()
+        self.closed = False
+
+    def get_size(self) -> tuple[int, int]:
+        return self._size
+
+    def get_width(self) -> int:
+        return self._size[0]
+
+    def get_height(self) -> int:
+        return self._size[1]
+
+    def fill(self, color, rect=None, special_flags: int = 0):
+        self._recording.append(("fill", (color, rect, special_flags)))
+
+    def blit(self, source: pygame.Surface, dest, area=None, special_flags: int = 0):
+        self._recording.append(("blit", (source, tuple(dest), area, special_flags)))
+
+    def blits(self, blit_sequence: Sequence, doreturn: bool = True):
+        self._recording.append(("blits", (tuple(blit_sequence), False)))
+
+    def present(self):
+        """Publish the recorded frame, replacing any frame not rendered yet."""
+        frame = tuple(self._recording)
+        self._recording = []
+        with self._published:
+            self._latest = frame
+            self._frame += 1
+            self._published.notify()
+
+    def close(self):
+        with self._published:
+            self.closed = True
+            self._published.notify()
+
+    def wait_frame(self, after: int, timeout: float = 0.1):
+        """Block until a frame newer than `after` is published.
+
+        Returns:
+            (frame number, commands), or None on timeout or close
+        """
+        with self._published:
+            if self._frame == after and not self.closed:
+                self._published.wait(timeout)
+            if self._frame == after or self.closed:
+                return None
+            return self._frame, self._latest
+
+
+class RenderThread(threading.Thread):
+    """Replays frames published on a RenderCanvas to the display and flips.
+
+    Lets the simulation of the next frame overlap with blitting and
+    presenting the previous one. Frames published faster than they can be
+    presented are dropped (counted in `dropped`).
+
+    The display must only be touched from this thread while it runs, and
+    some platforms (macOS) only allow presenting from the main thread.
+    """
+
+    def __init__(self, display: pygame.Surface, canvas: RenderCanvas):
+        super().__init__(name="render", daemon=True)
+        self.display = display
+        self.canvas = canvas
+        self.rendered = 0
+        self.dropped = 0
+        self.render_time = 0.0
+        self.error: Optional[BaseException] = None
+
+    def run(self):
+        last = 0
+        display = self.display
+        try:
+            while not self.canvas.closed:
+                published = self.canvas.wait_frame(last)
+                if published is None:
+                    continue
+                frame, commands = published
+                self.dropped += frame - last - 1
+                last = frame
+                start = time.perf_counter()
+                for method, args in commands:
+                    getattr(display, method)(*args)
+                pygame.display.flip()
+                self.render_time += time.perf_counter() - start
+                self.rendered += 1
+        except BaseException as error:
+            self.error = error
+            raise
+
+    def stop(self):
+        self.canvas.close()
+        self.join()
+
+    def report(self) -> str:
+        average = self.render_time / self.rendered * 1000 if self.rendered else 0.0
+        return (
+            f"Render thread: {self.rendered} frames, {self.dropped} dropped, "
+            f"{average:.2f}ms average"
+        )
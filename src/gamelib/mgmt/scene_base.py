@@ -3,15 +3,30 @@ from typing import Optional
 
 import pygame
 
+from gamelib.mgmt.game_event import ListenerScope
+
 
 class SceneBase(ABC):
     def __init__(self, screen: pygame.Surface):
         self.next = self
         self.screen = screen
+        # Listeners registered with this scope are released when the scene ends
+        self.listener_scope = ListenerScope()
+        # Whether the last update() drew a new frame that needs presenting
+        self.drew_frame = True
 
     def update(self, events, pressed_keys, dt: float = 0) -> None: ...
 
+    def on_enter(self, **kwargs) -> None:
+        """Called each time a SceneManager makes this scene active."""
+
+    def on_exit(self) -> None:
+        """Called when switching away from this scene."""
+        self.listener_scope.close()
+
     def switch_to_scene(self, next_scene: Optional["SceneBase"]):
+        if next_scene is not self:
+            self.on_exit()
         self.next = next_scene
 
     def terminate(self):
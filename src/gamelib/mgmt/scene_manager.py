@@ -0,0 +1,56 @@
+from typing import Callable
+
+import pygame
+
+from gamelib.mgmt.scene_base import SceneBase
+
+SceneFactory = Callable[[pygame.Surface, "SceneManager"], SceneBase]
+
+
+class SceneManager:
+    """Keeps scenes alive across transitions.
+
+    Scenes are built once from their registered factory and reused on every
+    later switch; on_enter() is responsible for resetting their state.
+
+    Usage:
+        scenes = SceneManager(screen)
+        scenes.register("main", MainScene)  # factory(screen, scenes)
+        first_scene = scenes.enter("main")
+        ...
+        scenes.switch(self, "game_over", final_score=self.score)
+    """
+
+    def __init__(self, screen: pygame.Surface):
+        self.screen = screen
+        self._factories: dict[str, SceneFactory] = {}
+        self._scenes: dict[str, SceneBase] = {}
+
+    def register(self, key: str, factory: SceneFactory):
+        self._factories[key] = factory
+
+    def get(self, key: str) -> SceneBase:
+        """Return the cached scene for key, constructing it on first use."""
+        scene = self._scenes.get(key)
+        if scene is None:
+            scene = self._factories[key](self.screen, self)
+            self._scenes[key] = scene
+        return scene
+
+    def preconstruct(self, *keys: str):
+        """Build scenes ahead of the transitions that will need them."""
+        for key in keys:
+            self.get(key)
+
+    def enter(self, key: str, **kwargs) -> SceneBase:
+        """Get a scene and prepare it to become active."""
+        scene = self.get(key)
+        scene.next = scene
+        scene.on_enter(**kwargs)
+        return scene
+
+    def switch(self, current: SceneBase, key: str, **kwargs) -> SceneBase:
+        """Leave current and make the scene registered as key the next scene."""
+        scene = self.get(key)
+        current.switch_to_scene(scene)
+        return self.enter(key, **kwargs)
@@ -0,0 +1,95 @@
+import os
+import struct
+from os.path import join, splitext
+from typing import Iterator, Optional
+
+import pygame
+
+SOUND_EXTENSIONS = (".wav", ".ogg", ".mp3", ".flac")
+
+_CACHE_MAGIC = b"SBK1"
+_CACHE_HEADER = struct.Struct("<4sQQ")
+
+
+class SoundBank:
+    """Decodes every sound in a directory once, addressable by file stem.
+
+    Sounds are converted to the mixer's format on load. If cache_dir is set,
+    the converted PCM is written there and reused on later launches as long
+    as the source file and the mixer format are unchanged.
+
+    Usage:
+        bank = SoundBank(join("assets", "sounds"), cache_dir=".cache")
+        bank.load()
+        mixer.play_sound(bank["small_explosion"])
+    """
+
+    def __init__(self, directory: str, cache_dir: Optional[str] = None):
+        self.directory = directory
+        self.cache_dir = cache_dir
+        self.sounds: dict[str, pygame.mixer.Sound] = {}
+        self.cache_hits = 0
+
+    def __getitem__(self, name: str) -> pygame.mixer.Sound:
+        return self.sounds[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sounds
+
+    def get(self, name: str) -> Optional[pygame.mixer.Sound]:
+        return self.sounds.get(name)
+
+    def sources(self) -> list[str]:
+        """List the sound files in the bank directory, sorted by name."""
+        return sorted(
+            filename
+            for filename in os.listdir(self.directory)
+            if splitext(filename)[1].lower() in SOUND_EXTENSIONS
+        )
+
+    def load(self) -> dict[str, pygame.mixer.Sound]:
+        """Load every sound in the directory."""
+        for _ in self.iter_load():
+            pass
+        return self.sounds
+
+    def iter_load(self) -> Iterator[str]:
+        """Load sounds one at a time, yielding each name once it is ready."""
+        for filename in self.sources():
+            yield self.load_file(filename)
+
+    def load_file(self, filename: str) -> str:
+        """Load a single file from the bank directory and return its name."""
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        name = splitext(filename)[0]
+        self.sounds[name] = self._load(join(self.directory, filename), name)
+        return name
+
+    def _load(self, path: str, name: str) -> pygame.mixer.Sound:
+        if self.cache_dir is None:
+            return pygame.mixer.Sound(path)
+
+        frequency, size, channels = pygame.mixer.get_init()
+        cache_path = join(self.cache_dir, f"{name}-{frequency}-{size}-{channels}.pcm")
+        stat = os.stat(path)
+        header = _CACHE_HEADER.pack(_CACHE_MAGIC, stat.st_size, stat.st_mtime_ns)
+
+        try:
+            with open(cache_path, "rb") as cache_file:
+                if cache_file.read(_CACHE_HEADER.size) == header:
+                    self.cache_hits += 1
+                    return pygame.mixer.Sound(buffer=cache_file.read())
+        except OSError:
+            pass
+
+        sound = pygame.mixer.Sound(path)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(cache_path, "wb") as cache_file:
+                cache_file.write(header)
+                cache_file.write(sound.get_raw())
+        except OSError:
+            # The cache is optional (e.g. read-only or web filesystems)
+            pass
+        return sound
@@ -0,0 +1,45 @@
+import time
+from typing import Optional
+
+
+class StartupTimer:
+    """Records startup milestones and accumulated phase durations.
+
+    Usage:
+        timer = StartupTimer()  # create as early as possible
+        pygame.init()
+        timer.mark("pygame.init")
+        print(timer.report())
+    """
+
+    def __init__(self, start: Optional[float] = None):
+        self.start = time.perf_counter() if start is None else start
+        self.milestones: list[tuple[str, float]] = []
+        self.durations: dict[str, float] = {}
+
+    def mark(self, name: str):
+        """Record a milestone at the current time."""
+        self.milestones.append((name, time.perf_counter() - self.start))
+
+    def add(self, name: str, seconds: float):
+        """Accumulate time spent in a phase that is spread over milestones."""
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def elapsed(self, name: str) -> Optional[float]:
+        """Seconds from start to the first milestone with this name."""
+        for milestone, at in self.milestones:
+            if milestone == name:
+                return at
+        return None
+
+    def report(self) -> str:
+        lines = ["Startup timings (ms):"]
+        previous = 0.0
+        for name, at in self.milestones:
+            lines.append(
+                f"  {name:<16}{(at - previous) * 1000:>9.1f}  @{at * 1000:.1f}"
+            )
+            previous = at
+        for name, seconds in self.durations.items():
+            lines.append(f"  {name:<16}{seconds * 1000:>9.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,224 @@
+"""Step API for driving MainScene from automated agents.
+
+Every environment owns its own esper world, so a batch of environments
+runs in a single process. Observations are written into preallocated
+NumPy arrays that are returned without copying; they are overwritten by
+the next reset() or step(), so agents that keep history must copy them.
+"""
+
+import random
+from typing import Optional, Sequence
+
+import esper
+import numpy as np
+import pygame
+
+from gamelib.ecs import (
+    ColliderComponent,
+    PlayerControllerComponent,
+    PositionComponent,
+)
+from gamelib.mgmt.game_event import EVENT_BUS
+from gamelib.mgmt.scene_manager import SceneManager
+
+from starfighter_game.scenes import (
+    GAME_OVER_SCENE,
+    MAIN_SCENE,
+    GameOverScene,
+    MainScene,
+)
+from starfighter_game.simulation import (
+    HEIGHT,
+    NO_KEYS,
+    SCALE,
+    SPACE,
+    WIDTH,
+    init_headless,
+)
+
+FEATURES = "features"
+PIXELS = "pixels"
+
+# Actions
+NOOP = 0
+FLIP = 1
+
+DEFAULT_NEAREST = 8
+
+
+def feature_size(nearest: int = DEFAULT_NEAREST) -> int:
+    # Player x, y, direction; then dx, dy, present for each nearest enemy
+    return 3 + 3 * nearest
+
+
+class StarfighterEnv:
+    """A single game stepped one frame per action.
+
+    Args:
+        observation: "features" for a float32 vector built from the
+            position and collider stores, "pixels" for the rendered frame
+            as an (height, width, 4) uint8 RGBX array
+        seed: Seeds Python's random module on every reset
+        max_steps: Episode length limit, None for unlimited
+        nearest: Enemies described in the feature vector
+        out: Array to write observations into (used by BatchedEnv)
+        world: esper world name, must be unique per environment
+        fps: Fixed simulation rate
+    """
+
+    def __init__(
+        self,
+        observation: str = FEATURES,
+        seed: Optional[int] = None,
+        max_steps: Optional[int] = None,
+        nearest: int = DEFAULT_NEAREST,
+        out: Optional[np.ndarray] = None,
+        world: str = "env",
+        fps: int = 60,
+    ):
+        if observation not in (FEATURES, PIXELS):
+            raise ValueError(f"Unknown observation type {observation!r}")
+        init_headless()
+        self.observation_type = observation
+        self.seed = seed
+        self.max_steps = max_steps
+        self.nearest = nearest
+        self.dt = 1.0 / fps
+        self.steps = 0
+
+        size = (WIDTH * SCALE, HEIGHT * SCALE)
+        if observation == PIXELS:
+            if out is None:
+                out = np.zeros((size[1], size[0], 4), dtype=np.uint8)
+            # The scene draws straight into the observation array
+            screen = pygame.image.frombuffer(out, size, "RGBX")
+        else:
+            if out is None:
+                out = np.zeros(feature_size(nearest), dtype=np.float32)
+            screen = pygame.Surface(size)
+        self.observation = out
+        self._scale = np.array(size, dtype=np.float32)
+
+        self.scenes = SceneManager(screen)
+        self.scenes.register(
+            MAIN_SCENE, lambda screen, scenes: MainScene(screen, scenes, world=world)
+        )
+        self.scenes.register(GAME_OVER_SCENE, GameOverScene)
+        self.scene: MainScene = self.scenes.get(MAIN_SCENE)
+        if observation == FEATURES:
+            self.scene.render_interval = 0
+
+    def reset(self) -> np.ndarray:
+        if self.seed is not None:
+            random.seed(self.seed)
+        self.scenes.enter(MAIN_SCENE)
+        self.steps = 0
+        return self._observe()
+
+    def step(self, action: int) -> tuple[np.ndarray, float, bool]:
+        """Advance one frame.
+
+        Returns:
+            observation, reward (asteroids destroyed this frame), done
+        """
+        scene = self.scene
+        esper.switch_world(scene.world)
+        score = scene.score
+        scene.update([], SPACE if action == FLIP else NO_KEYS, self.dt)
+        EVENT_BUS.dispatch()
+        self.steps += 1
+        done = scene.player_spawner.game_over or (
+            self.max_steps is not None and self.steps >= self.max_steps
+        )
+        if done and not scene.player_spawner.game_over:
+            scene.on_exit()
+        return self._observe(), float(scene.score - score), done
+
+    def _observe(self) -> np.ndarray:
+        if self.observation_type == FEATURES:
+            self._write_features(self.observation)
+        return self.observation
+
+    def _write_features(self, out: np.ndarray):
+        out[:] = 0
+        esper.switch_world(self.scene.world)
+        player = self.scene.player_spawner.player_pos
+        origin = np.array((player.x, player.y), dtype=np.float32)
+        out[:2] = origin / self._scale
+        for _, controller in esper.get_component(PlayerControllerComponent):
+            out[2] = 1.0 if controller.base_speed > 0 else -1.0
+
+        enemies = [
+            (position.x, position.y)
+            for _, (collider, position) in esper.get_components(
+                ColliderComponent, PositionComponent
+            )
+            if "enemy" in collider.tags
+        ]
+        if not enemies:
+            return
+        offsets = (np.array(enemies, dtype=np.float32) - origin) / self._scale
+        distances = np.einsum("ij,ij->i", offsets, offsets)
+        count = min(self.nearest, len(enemies))
+        nearest = np.argsort(distances)[:count]
+        rows = out[3:].reshape(self.nearest, 3)
+        rows[:count, :2] = offsets[nearest]
+        rows[:count, 2] = 1.0
+
+
+class BatchedEnv:
+    """Several environments stepped together.
+
+    Observations of all environments live in one array (one row per
+    environment) that is returned as is. Finished environments are reset
+    automatically; their row then holds the first observation of the next
+    episode.
+
+    Usage:
+        envs = BatchedEnv(64, seed=0)
+        obs = envs.reset()
+        obs, rewards, dones = envs.step(actions)
+    """
+
+    def __init__(
+        self,
+        count: int,
+        observation: str = FEATURES,
+        seed: Optional[int] = None,
+        max_steps: Optional[int] = None,
+        nearest: int = DEFAULT_NEAREST,
+        fps: int = 60,
+    ):
+        if observation == PIXELS:
+            shape = (count, HEIGHT * SCALE, WIDTH * SCALE, 4)
+            self.observations = np.zeros(shape, dtype=np.uint8)
+        else:
+            shape = (count, feature_size(nearest))
+            self.observations = np.zeros(shape, dtype=np.float32)
+        self.rewards = np.zeros(count, dtype=np.float32)
+        self.dones = np.zeros(count, dtype=bool)
+        self.envs = [
+            StarfighterEnv(
+                observation,
+                seed=None if seed is None else seed + i,
+                max_steps=max_steps,
+                nearest=nearest,
+                out=self.observations[i],
+                world=f"env-{i}",
+                fps=fps,
+            )
+            for i in range(count)
+        ]
+
+    def reset(self) -> np.ndarray:
+        for env in self.envs:
+            env.reset()
+        return self.observations
+
+    def step(self, actions: Sequence[int]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            _, self.rewards[i], done = env.step(action)
+            self.dones[i] = done
+            if done:
+                env.reset()
+        return self.observations, self.rewards, self.dones
@@ -0,0 +1,47 @@
+from os.path import join, splitext
+
+from gamelib.mgmt.assets import AssetStore, ImageSpec, font_loader
+from gamelib.mgmt.image_cache import ImageCache, cached_image_loader
+from gamelib.mgmt.sound_bank import SoundBank
+
+SCALE = 4
+WIDTH, HEIGHT = 160, 144
+
+IMAGES_DIR = join("assets", "images")
+SOUNDS_DIR = join("assets", "sounds")
+SOUND_CACHE_DIR = join(".cache", "sounds")
+# Written by bake.py
+IMAGE_CACHE_DIR = join(".cache", "images")
+FONT_PATH = join("assets", "fonts", "kenney-space.regular.ttf")
+
+ASSETS = AssetStore()
+SOUND_BANK = SoundBank(SOUNDS_DIR, cache_dir=SOUND_CACHE_DIR)
+IMAGE_CACHE = ImageCache(IMAGE_CACHE_DIR)
+
+IMAGE_SPECS: dict[str, ImageSpec] = {}
+
+# Sprites, scaled up by SCALE
+for _name in ("asteroid", "asteroid_destroyed", "player"):
+    IMAGE_SPECS[_name] = ImageSpec(
+        join(IMAGES_DIR, f"{_name}.png"), scale=SCALE, transparent_pixels=True
+    )
+
+# Full-screen images
+for _name in ("background", "game_over_screen"):
+    IMAGE_SPECS[_name] = ImageSpec(
+        join(IMAGES_DIR, f"{_name}.png"), size=(WIDTH * SCALE, HEIGHT * SCALE)
+    )
+
+for _name, _spec in IMAGE_SPECS.items():
+    ASSETS.register(_name, cached_image_loader(IMAGE_CACHE, _name, _spec))
+
+ASSETS.register("font_small", font_loader(FONT_PATH, 12))
+ASSETS.register("font_large", font_loader(FONT_PATH, 36))
+
+
+def _sound_loader(filename: str):
+    return lambda: SOUND_BANK[SOUND_BANK.load_file(filename)]
+
+
+for _filename in SOUND_BANK.sources():
+    ASSETS.register(splitext(_filename)[0], _sound_loader(_filename))
@@ -1,56 +1,73 @@
-from os.path import join
-from typing import Tuple
-from psygnal import Signal
+from typing import Sequence, Tuple
 import pygame
 import esper
 
+from starfighter_game.assets import ASSETS
 from starfighter_game.game_events import ON_ASTEROID_DESTROYED
+from starfighter_game.regions import PLAYFIELD
 
 from gamelib.ecs import (
     ColliderComponent,
     VelocityComponent,
     PositionComponent,
     PositionBoundsComponent,
+    EffectSystem,
     RenderSurfaceComponent,
-    TimerComponent,
 )
+from gamelib.ecs.prefab import Prefab, intern_tags
 
 RED = (255, 0, 0)
 SCALE = 4
 ASTEROID_W = 16 * SCALE
 ASTEROID_H = 16 * SCALE
+ASTEROID_TAGS = intern_tags("enemy")
 
-EXPLOSION_PATH = join("assets", "sounds", "small_explosion.wav")
-SPRITE_PATH = join("assets", "images", "asteroid.png")
-DESTROYED_SPRITE_PATH = join("assets", "images", "asteroid_destroyed.png")
+ASTEROID = "asteroid"
 
+SPRITE = "asteroid"
+DESTROYED_SPRITE = "asteroid_destroyed"
 
-class AsteroidSpawner:
-    destroyed_asteroid = Signal(int)
 
-    def __init__(self, spawn_interval: int):
+class AsteroidSpawner:
+    def __init__(self, spawn_interval: int, effects: EffectSystem):
         self._spawn_interval = spawn_interval
         self._last_spawn_time = 0
+        # Multiplies the spawn interval, see MainScene.add_quality_steps()
+        self.throttle = 1.0
+        self._effects = effects
+        if DESTROYED_SPRITE not in effects.sprite_ids:
+            effects.register_sprite(DESTROYED_SPRITE, [ASSETS[DESTROYED_SPRITE]])
 
-    def spawn_destroyed_asteroid(self, position: Tuple[int, int]):
-        entity = esper.create_entity(
-            PositionComponent(position[0], position[1]),
-            RenderSurfaceComponent.from_image(DESTROYED_SPRITE_PATH, True).scale(SCALE),
+        on_collision = self.on_asteroid_collided
+        self.prefab = Prefab(
+            ASTEROID,
+            shared=[
+                PositionBoundsComponent(PLAYFIELD),
+                RenderSurfaceComponent(ASSETS[SPRITE]),
+            ],
+            factories=[
+                lambda: VelocityComponent((0, 2)),
+                lambda: ColliderComponent(
+                    ASTEROID_W,
+                    ASTEROID_H,
+                    tags=ASTEROID_TAGS,
+                    on_collision=on_collision,
+                ),
+            ],
         )
 
-        def destroy_entity(entity):
-            if esper.has_component(entity, RenderSurfaceComponent):
-                esper.delete_entity(entity)
+    def reset(self):
+        self._last_spawn_time = 0
 
-        esper.add_component(entity, TimerComponent(0.2, lambda: destroy_entity(entity)))
+    def spawn_destroyed_asteroid(self, position: Tuple[int, int]):
+        self._effects.emit(DESTROYED_SPRITE, position[0], position[1], lifetime=0.2)
 
     def on_asteroid_collided(self, entity, other_entity, tags):
         if "projectile" in tags or "player" in tags:
             pos_comp = esper.component_for_entity(entity, PositionComponent)
             pos = pos_comp.x, pos_comp.y
             esper.delete_entity(entity)
-            self.destroyed_asteroid.emit(entity)
-            ON_ASTEROID_DESTROYED.trigger(entity)
+            ON_ASTEROID_DESTROYED.trigger(entity, esper.current_world)
             self.spawn_destroyed_asteroid(pos)
             # self._sound.play()
 
@@ -59,28 +76,12 @@ class AsteroidSpawner:
         current_time: int,
         position: Tuple[int, int],
     ) -> None:
-        if current_time - self._last_spawn_time < self._spawn_interval:
+        if current_time - self._last_spawn_time < self._spawn_interval * self.throttle:
             return
 
-        pos_component = PositionComponent(position[0], position[1])
-        pos_bounds_component = PositionBoundsComponent(
-            -50, 850, -50, 650, lambda e: esper.delete_entity(e)
-        )
-        surface_component = RenderSurfaceComponent.from_image(SPRITE_PATH, True).scale(
-            SCALE
-        )
-        move_linear_component = VelocityComponent((0, 2))
-        collider_component = ColliderComponent(
-            ASTEROID_W,
-            ASTEROID_H,
-            tags={"enemy"},
-            on_collision=self.on_asteroid_collided,
-        )
-        esper.create_entity(
-            pos_component,
-            pos_bounds_component,
-            surface_component,
-            move_linear_component,
-            collider_component,
-        )
+        self.prefab.spawn(position)
         self._last_spawn_time = current_time
+
+    def spawn_wave(self, positions: Sequence[Tuple[int, int]]) -> list[int]:
+        """Spawn an asteroid at every position at once, ignoring the interval."""
+        return self.prefab.spawn_many(positions)
@@ -1,4 +1,6 @@
 from gamelib.mgmt import GameEvent
 
-ON_ASTEROID_DESTROYED = GameEvent()
-ON_PROJECTILE_LAUNCHED = GameEvent()
+# Coalesced: listeners receive one list of (entity, world) tuples per frame,
+# world being the name of the esper world the asteroid belonged to
+ON_ASTEROID_DESTROYED = GameEvent("asteroid_destroyed", coalesce=True)
+ON_PROJECTILE_LAUNCHED = GameEvent("projectile_launched")
@@ -0,0 +1,8 @@
+from gamelib.ecs.prefab import PrefabRegistry
+
+from starfighter_game.powerup import SPEED_POWERUP, create_speed_powerup_prefab
+from starfighter_game.projectile import PROJECTILE, create_projectile_prefab
+
+PREFABS = PrefabRegistry()
+PREFABS.register(PROJECTILE, create_projectile_prefab)
+PREFABS.register(SPEED_POWERUP, create_speed_powerup_prefab)
@@ -1,16 +1,21 @@
-from typing import Any, Tuple
+from typing import Any, Callable, Sequence, Tuple
 import esper
-import pygame
 from gamelib.ecs.collision import ColliderComponent
-from gamelib.ecs.geometry import VelocityComponent, PositionComponent
+from gamelib.ecs.geometry import VelocityComponent
 from gamelib.ecs.rendering import RenderSurfaceComponent
+from gamelib.ecs.prefab import Prefab, intern_tags
+from gamelib.ecs.spawning import create_entities, spawn_batch, with_position
 from gamelib.ecs.geometry import PositionBoundsComponent
-
+from starfighter_game.regions import PLAYFIELD
 
 PROJ_COLOR = (181, 223, 228)
 PROJ_V = 5
 PROJ_W = 8
 PROJ_H = 8
+PROJ_TAGS = intern_tags("projectile")
+PROJ_IGNORE_TAGS = intern_tags("player")
+
+PROJECTILE = "projectile"
 
 
 def on_projectile_collided(entity, other_entity, tags):
@@ -18,41 +23,37 @@ def on_projectile_collided(entity, other_entity, tags):
         esper.delete_entity(entity)
 
 
-class Projectile:
-    def __init__(self, screen: pygame.Surface):
-        self.screen = screen
-        self.rect = pygame.Rect(0, 0, PROJ_W, PROJ_H)
-
-    @property
-    def components(self) -> list[Any]:
-        return [
-            PositionComponent(0, 0),
-            PositionBoundsComponent(
-                -50, 850, -50, 650, lambda e: esper.delete_entity(e)
-            ),
-            RenderSurfaceComponent.from_rect(self.rect, PROJ_COLOR),
-            VelocityComponent((0, -5)),
-            ColliderComponent(
+def create_projectile_prefab() -> Prefab:
+    return Prefab(
+        PROJECTILE,
+        shared=[
+            PositionBoundsComponent(PLAYFIELD),
+            RenderSurfaceComponent.solid_rect(PROJ_W, PROJ_H, PROJ_COLOR),
+        ],
+        factories=[
+            lambda: VelocityComponent((0, -PROJ_V)),
+            lambda: ColliderComponent(
                 PROJ_W,
                 PROJ_H,
-                tags={"projectile"},
-                ignore_tags={"player"},
+                tags=PROJ_TAGS,
+                ignore_tags=PROJ_IGNORE_TAGS,
                 on_collision=on_projectile_collided,
+                fast=True,
             ),
-        ]
+        ],
+    )
 
 
 class EntitySpawner:
 
     # TO-DO: Add necessary systems to system manager
-    def spawn(self, position: Tuple[int, int], components: list[Any]) -> None:
-        new_entity = esper.create_entity()
-        # Can't specify components within create_entity() for some reason?
-        for component in components:
-            esper.add_component(new_entity, component)
-        if esper.has_component(new_entity, PositionComponent):
-            pos = esper.component_for_entity(new_entity, PositionComponent)
-            pos.x = position[0]
-            pos.y = position[1]
-        else:
-            esper.add_component(new_entity, PositionComponent(position[0], position[1]))
+    def spawn(self, position: Tuple[int, int], components: list[Any]) -> int:
+        return create_entities([with_position(components, position)])[0]
+
+    def spawn_many(
+        self,
+        positions: Sequence[Tuple[int, int]],
+        template: Callable[[], list[Any]],
+    ) -> list[int]:
+        """Spawn one entity per position as a single structural change."""
+        return spawn_batch(template, positions)
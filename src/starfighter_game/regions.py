@@ -0,0 +1,6 @@
+from gamelib.ecs.geometry import BoundsRegion
+
+# Entities leaving the screen with some margin are despawned
+PLAYFIELD = BoundsRegion("playfield", -50, 850, -50, 650)
+
+REGIONS = (PLAYFIELD,)
@@ -1,24 +1,44 @@
-from os.path import join
+import asyncio
+import os
 import random
+from typing import Callable, Optional
 import esper
+from gamelib.mgmt.assets import AssetLoader
+from gamelib.mgmt.frame_governor import FrameGovernor
 from gamelib.mgmt.scene_base import SceneBase
+from gamelib.mgmt.scene_manager import SceneManager
 
 from gamelib.ecs import (
     CollisionProcessor,
     CustomUpdateProcessor,
+    EffectProcessor,
+    EffectSystem,
     MoveProcessor,
+    ParentComponent,
     PositionBoundsProcessor,
     RenderSurfaceProcessor,
     ModifierProcessor,
+    SpatialIndexProcessor,
     PlayerMoveProcessor,
     TimerProcessor,
+    PlayerControllerComponent,
+    PositionComponent,
+    ProbeProcessor,
+    TransformProcessor,
+    Watch,
 )
+from gamelib.ecs.scheduling import add_processor
+from gamelib.ecs.snapshot import restore_world, save_world
+from gamelib.ecs.worlds import clear_world, use_entity_allocator
 import pygame
 
+from starfighter_game.assets import ASSETS
 from starfighter_game.asteroid import AsteroidSpawner
-from starfighter_game.game_events import ON_PROJECTILE_LAUNCHED
-from starfighter_game.powerup import SpeedPowerUp
-from starfighter_game.projectile import EntitySpawner, Projectile
+from starfighter_game.game_events import ON_ASTEROID_DESTROYED, ON_PROJECTILE_LAUNCHED
+from starfighter_game.powerup import SPEED_POWERUP
+from starfighter_game.prefabs import PREFABS
+from starfighter_game.projectile import PROJECTILE, EntitySpawner
+from starfighter_game.snapshots import create_snapshot_registry
 from starfighter_game.starfighter_player import PlayerSpawner
 
 ASTEROID_WIDTH = 50
@@ -26,59 +46,263 @@ POWERUP_RADIUS = 20
 
 BACKGROUND_COLOR = (48, 81, 130)
 FONT_COLOR = (181, 223, 228)
-BACKDROP_PATH = join("assets", "images", "background.png")
-GAMEOVER_PATH = join("assets", "images", "game_over_screen.png")
-
-FONT_PATH = join("assets", "fonts", "kenney-space.regular.ttf")
+PROGRESS_BAR_HEIGHT = 8
 
 SCALE = 4
 WIDTH, HEIGHT = 160, 144
 
+# Set to a file path to record telemetry; probes are not added otherwise
+TELEMETRY_PATH = os.environ.get("STARFIGHTER_TELEMETRY")
+
+# Processor schedules: seconds between runs, milliseconds per frame
+BOUNDS_INTERVAL_S = 0.25
+MODIFIER_INTERVAL_S = 0.1
+CUSTOM_UPDATE_BUDGET_MS = 1.0
+
+MAIN_SCENE = "main"
+GAME_OVER_SCENE = "game_over"
+
+
+class LoadingScene(SceneBase):
+    """Shows a progress bar while an AssetLoader runs between frames.
+
+    Args:
+        screen: Display surface
+        loader: Loader whose run() task is started on the first update
+        on_loaded: Called once loading finishes; returns the next scene
+    """
+
+    def __init__(
+        self,
+        screen: pygame.Surface,
+        loader: AssetLoader,
+        on_loaded: Callable[[], SceneBase],
+    ):
+        super().__init__(screen)
+        self.loader = loader
+        self.on_loaded = on_loaded
+        self._task = None
+
+    def update(self, events, pressed_keys, dt: float = 0) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self.loader.run())
+        elif self._task.done():
+            # Re-raises loading errors
+            self._task.result()
+            self.switch_to_scene(self.on_loaded())
+            return
+
+        self.screen.fill(BACKGROUND_COLOR)
+        bar = pygame.Rect(
+            0,
+            (self.screen.get_height() - PROGRESS_BAR_HEIGHT) // 2,
+            int(self.screen.get_width() * self.loader.progress),
+            PROGRESS_BAR_HEIGHT,
+        )
+        # fill() rather than pygame.draw, so any surface-like canvas works
+        self.screen.fill(FONT_COLOR, bar)
+
 
 class MainScene(SceneBase):
-    def __init__(self, screen: pygame.Surface):
+    """The game itself.
+
+    Args:
+        screen: Surface the scene draws to
+        scenes: Manager used for switching to the game over scene
+        world: Name of the esper world owned by this scene; scenes with
+            different worlds can run side by side in one process
+    """
+
+    def __init__(
+        self, screen: pygame.Surface, scenes: SceneManager, world: str = "main"
+    ):
         super().__init__(screen)
+        self.scenes = scenes
+        self.world = world
         esper.switch_world("default")
         try:
-            esper.delete_world("main")
+            esper.delete_world(world)
         except KeyError:
             pass
-        esper.switch_world("main")
-        esper.clear_database()
-        esper.add_processor(PlayerMoveProcessor(), priority=99)
+        esper.switch_world(world)
+        clear_world()
+        # Entities come and go all game long; keep their IDs compact
+        self.entities = use_entity_allocator()
+        esper.add_processor(
+            PlayerMoveProcessor(
+                keys=lambda: self.pressed_keys, clock=lambda: self.time_ms
+            ),
+            priority=99,
+        )
         esper.add_processor(MoveProcessor(), priority=98)
-        esper.add_processor(PositionBoundsProcessor(), priority=97)
-        esper.add_processor(CollisionProcessor(), priority=90)
-        esper.add_processor(CustomUpdateProcessor(), priority=80)
+        self.transform_processor = TransformProcessor()
+        esper.add_processor(self.transform_processor, priority=97)
+        # Entities only leave the bounds off screen, so culling can lag
+        add_processor(
+            PositionBoundsProcessor(), priority=97, interval_s=BOUNDS_INTERVAL_S
+        )
+        # Shared by every system querying neighbours this frame
+        spatial_processor = SpatialIndexProcessor()
+        self.spatial_index = spatial_processor.index
+        esper.add_processor(spatial_processor, priority=96)
+        self.collision_processor = CollisionProcessor()
+        esper.add_processor(self.collision_processor, priority=90)
+        self.custom_processor = CustomUpdateProcessor()
+        add_processor(
+            self.custom_processor, priority=80, budget_ms=CUSTOM_UPDATE_BUDGET_MS
+        )
         esper.add_processor(TimerProcessor(), priority=70)
-        esper.add_processor(RenderSurfaceProcessor(screen))
-        esper.add_processor(ModifierProcessor())
+        self.render_processor = RenderSurfaceProcessor(screen)
+        esper.add_processor(self.render_processor)
+        add_processor(ModifierProcessor(), interval_s=MODIFIER_INTERVAL_S)
+
+        self.effects = EffectSystem()
+        # Drawn after the world's sprites
+        self.effect_processor = EffectProcessor(self.effects, screen)
+        esper.add_processor(self.effect_processor, priority=-10)
+
+        self.probes = None
+        if TELEMETRY_PATH:
+            self.probes = ProbeProcessor(
+                [
+                    Watch(
+                        "player_speed",
+                        PlayerControllerComponent,
+                        "base_speed",
+                        every=60,
+                    ),
+                    Watch(
+                        "entity_y",
+                        PositionComponent,
+                        "y",
+                        every=30,
+                        buckets=range(0, HEIGHT * SCALE, 64),
+                    ),
+                ],
+                path=TELEMETRY_PATH,
+            )
+            esper.add_processor(self.probes, priority=-100)
 
-        self.asteroid_spawner = AsteroidSpawner(1000)
+        self.asteroid_spawner = AsteroidSpawner(1000, self.effects)
         self.player_spawner = PlayerSpawner()
         self.entity_spawner = EntitySpawner()
 
-        self.backdrop = pygame.transform.scale(
-            pygame.image.load(BACKDROP_PATH).convert(),
-            (WIDTH * SCALE, HEIGHT * SCALE),
-        )
+        self.backdrop = ASSETS["background"]
+        self.score = 0
+        # Game time, advanced by each update's dt, so headless runs can go
+        # faster than real time
+        self.time_ms = 0.0
+        # Key state of the current update, read by PlayerMoveProcessor
+        self.pressed_keys = None
+        self.last_bullet_time = 0
+        # Draw every n-th frame only (0 for never); the simulation runs
+        # every frame
+        self.render_interval = 1
+        self._frame = 0
+
+        scenes.preconstruct(GAME_OVER_SCENE)
+
+    def on_enter(self, **kwargs) -> None:
+        self.reset()
+
+    def on_exit(self) -> None:
+        super().on_exit()
+        if self.probes:
+            self.probes.flush()
+
+    def reset(self) -> None:
+        """Start a new game, keeping the world's processors and all assets."""
+        esper.switch_world(self.world)
+        clear_world()
+        self.collision_processor.clear_contacts()
+        self.custom_processor.restart()
+        self.transform_processor.clear()
+        self.spatial_index.clear()
+        self.effects.clear()
+        self.asteroid_spawner.reset()
 
         self.player_spawner.spawn(
-            (screen.get_width() // 2, screen.get_height() - 24 * SCALE), screen
+            (self.screen.get_width() // 2, self.screen.get_height() - 24 * SCALE),
+            self.screen,
         )
 
         self.score = 0
 
-        def add_score(points: int):
-            self.score += points
+        def add_score(batch: list[tuple[int, str]]):
+            # The bus is shared by the scenes of all worlds in the process
+            self.score += sum(1 for _, world in batch if world == self.world)
+
+        ON_ASTEROID_DESTROYED.add_listener(add_score, scope=self.listener_scope)
+        self.time_ms = 0.0
+        self.last_bullet_time = 0
+
+    def add_quality_steps(self, governor: FrameGovernor) -> None:
+        """Register this scene's load shedding, cheapest quality loss first."""
+
+        def set_effect_limit(limit: int):
+            self.effects.limit = limit
 
-        self.asteroid_spawner.destroyed_asteroid.connect(lambda entity: add_score(1))
-        self.last_bullet_time = pygame.time.get_ticks()
+        def set_spawn_throttle(throttle: float):
+            self.asteroid_spawner.throttle = throttle
+
+        def set_render_interval(interval: int):
+            self.render_interval = interval
+
+        def set_collision_interval(interval: int):
+            self.collision_processor.interval = interval
+
+        capacity = self.effects.capacity
+        governor.add_step(
+            "effects",
+            lambda: set_effect_limit(capacity // 8),
+            lambda: set_effect_limit(capacity),
+        )
+        governor.add_step(
+            "spawns", lambda: set_spawn_throttle(2.0), lambda: set_spawn_throttle(1.0)
+        )
+        governor.add_step(
+            "render", lambda: set_render_interval(2), lambda: set_render_interval(1)
+        )
+        governor.add_step(
+            "collision",
+            lambda: set_collision_interval(2),
+            lambda: set_collision_interval(1),
+        )
+
+    def save_snapshot(self, path: Optional[str] = None) -> bytes:
+        """Serialize the current game world (see gamelib.ecs.snapshot)."""
+        esper.switch_world(self.world)
+        return save_world(create_snapshot_registry(self), path)
+
+    def restore_snapshot(self, data: bytes) -> None:
+        """Replace the game world with a snapshot taken from this scene."""
+        esper.switch_world(self.world)
+        restore_world(data, create_snapshot_registry(self))
+        self.collision_processor.clear_contacts()
+        self.custom_processor.restart()
+        self.transform_processor.clear()
+        for entity, (_, position) in esper.get_components(
+            PlayerControllerComponent, PositionComponent
+        ):
+            self.player_spawner.player_pos = position
+            for child, (link, child_position) in esper.get_components(
+                ParentComponent, PositionComponent
+            ):
+                if link.parent == entity:
+                    self.player_spawner.muzzle_pos = child_position
 
     def update(self, events, pressed_keys, dt: float = 0) -> None:
-        self.screen.fill(BACKGROUND_COLOR)
-        self.screen.blit(self.backdrop, (0, 0))
-        current_time = pygame.time.get_ticks()
+        self._frame += 1
+        render = bool(self.render_interval) and self._frame % self.render_interval == 0
+        self.drew_frame = render
+        self.render_processor.enabled = render
+        self.effect_processor.enabled = render
+        if render:
+            self.screen.fill(BACKGROUND_COLOR)
+            self.screen.blit(self.backdrop, (0, 0))
+        self.time_ms += dt * 1000
+        self.pressed_keys = pressed_keys
+        current_time = self.time_ms
 
         # Spawn asteroids
         x = random.randint(0, self.screen.get_width() - ASTEROID_WIDTH)
@@ -86,12 +310,9 @@ class MainScene(SceneBase):
 
         # Fire a bullet every second
         if current_time - self.last_bullet_time > 1000:  # 1000 milliseconds = 1 second
+            muzzle = self.player_spawner.muzzle_pos
             self.entity_spawner.spawn(
-                (
-                    self.player_spawner.player_pos.x + 32,
-                    self.player_spawner.player_pos.y,
-                ),
-                Projectile(self.screen).components,
+                (muzzle.x, muzzle.y), PREFABS[PROJECTILE].components()
             )
             ON_PROJECTILE_LAUNCHED.trigger()
             self.last_bullet_time = current_time
@@ -99,32 +320,36 @@ class MainScene(SceneBase):
         # Spawn a power-up randomly
         # if random.randint(1, 200) == 1:
         #     x = random.randint(POWERUP_RADIUS, self.screen.get_width() - POWERUP_RADIUS)
-        #     self.entity_spawner.spawn((x, 0), SpeedPowerUp(self.screen).components)
-
-        # Display score
-        font = pygame.font.Font(FONT_PATH, 12)
-        score_text = font.render(f"Score: {self.score}", True, FONT_COLOR)
-        self.screen.blit(score_text, (10, 10))
+        #     self.entity_spawner.spawn((x, 0), PREFABS[SPEED_POWERUP].components())
 
         esper.process(dt)
 
+        # Display score
+        if render:
+            font = ASSETS["font_small"]
+            score_text = font.render(f"Score: {self.score}", True, FONT_COLOR)
+            self.screen.blit(score_text, (10, 10))
+
         if self.player_spawner.game_over:
-            self.next = GameOverScene(self.screen, self.score)
+            # Leaving delivers this frame's events, which can still score
+            self.switch_to_scene(self.scenes.get(GAME_OVER_SCENE))
+            self.scenes.enter(GAME_OVER_SCENE, final_score=self.score)
 
 
 class GameOverScene(SceneBase):
-    def __init__(self, screen: pygame.Surface, final_score: int):
+    def __init__(self, screen: pygame.Surface, scenes: SceneManager):
         super().__init__(screen)
+        self.scenes = scenes
+        self.final_score = 0
+        self.game_over_screen = ASSETS["game_over_screen"]
+
+    def on_enter(self, final_score: int = 0, **kwargs) -> None:
         self.final_score = final_score
-        self.game_over_screen = pygame.transform.scale(
-            pygame.image.load(GAMEOVER_PATH).convert(),
-            (WIDTH * SCALE, HEIGHT * SCALE),
-        )
 
     def update(self, events, pressed_keys, dt: float = 0) -> None:
         self.screen.fill("black")
         self.screen.blit(self.game_over_screen, (0, 0))
-        font = pygame.font.Font(FONT_PATH, 36)
+        font = ASSETS["font_large"]
         score_text = font.render(f"Final Score: {self.final_score}", True, FONT_COLOR)
         self.screen.blit(
             score_text,
@@ -135,4 +360,11 @@ class GameOverScene(SceneBase):
         )
 
         if pressed_keys[pygame.K_RETURN]:
-            self.next = MainScene(self.screen)
+            self.scenes.switch(self, MAIN_SCENE)
+
+
+def create_scene_manager(screen: pygame.Surface) -> SceneManager:
+    scenes = SceneManager(screen)
+    scenes.register(MAIN_SCENE, MainScene)
+    scenes.register(GAME_OVER_SCENE, GameOverScene)
+    return scenes
@@ -0,0 +1,198 @@
+"""Headless MainScene runs for balancing and soak tests.
+
+esper's world and pygame's display are per process, so every game runs in
+its own worker process. Workers play their instances back to back with a
+dummy video driver and a fixed timestep, as fast as the CPU allows.
+"""
+
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from statistics import mean
+from typing import Callable, Iterable, Optional
+
+import esper
+import pygame
+
+SCALE = 4
+WIDTH, HEIGHT = 160, 144
+
+IDLE = "idle"
+RANDOM = "random"
+SCRIPTED = "scripted"
+
+
+@dataclass
+class InstanceConfig:
+    """One simulated game.
+
+    Attributes:
+        seed: Seeds the game's and the input policy's random numbers
+        policy: "idle", "random" or "scripted"
+        max_frames: Stop after this many frames if the player survives
+        fps: Fixed simulation rate
+        press_chance: Per-frame chance of pressing SPACE for "random"
+        script: Frames on which SPACE is pressed for "scripted"
+    """
+
+    seed: int
+    policy: str = RANDOM
+    max_frames: int = 3600
+    fps: int = 60
+    press_chance: float = 0.02
+    script: tuple[int, ...] = ()
+
+
+@dataclass
+class InstanceStats:
+    seed: int
+    policy: str
+    score: int
+    survival_s: float
+    frames: int
+    game_over: bool
+    peak_entities: int
+    mean_frame_ms: float
+    max_frame_ms: float
+
+
+@dataclass
+class FarmStats:
+    instances: list[InstanceStats] = field(default_factory=list)
+    wall_s: float = 0.0
+
+    def summary(self) -> dict:
+        if not self.instances:
+            return {"instances": 0, "wall_s": self.wall_s}
+        scores = [stats.score for stats in self.instances]
+        return {
+            "instances": len(self.instances),
+            "wall_s": round(self.wall_s, 2),
+            "frames": sum(stats.frames for stats in self.instances),
+            "score_mean": round(mean(scores), 2),
+            "score_min": min(scores),
+            "score_max": max(scores),
+            "survival_mean_s": round(
+                mean(stats.survival_s for stats in self.instances), 2
+            ),
+            "game_overs": sum(stats.game_over for stats in self.instances),
+            "peak_entities": max(stats.peak_entities for stats in self.instances),
+            "frame_mean_ms": round(
+                mean(stats.mean_frame_ms for stats in self.instances), 3
+            ),
+            "frame_max_ms": round(
+                max(stats.max_frame_ms for stats in self.instances), 3
+            ),
+        }
+
+
+class KeyState:
+    """Stands in for pygame.key.get_pressed() with a set of pressed keys."""
+
+    def __init__(self, pressed: Iterable[int] = ()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.pressed
+
+
+NO_KEYS = KeyState()
+SPACE = KeyState([pygame.K_SPACE])
+
+InputPolicy = Callable[[int], KeyState]
+
+
+def create_policy(config: InstanceConfig, rng: random.Random) -> InputPolicy:
+    """Build the function returning the key state for a frame number."""
+    if config.policy == IDLE:
+        return lambda frame: NO_KEYS
+    if config.policy == RANDOM:
+        return lambda frame: SPACE if rng.random() < config.press_chance else NO_KEYS
+    if config.policy == SCRIPTED:
+        script = frozenset(config.script)
+        return lambda frame: SPACE if frame in script else NO_KEYS
+    raise ValueError(f"Unknown input policy {config.policy!r}")
+
+
+_screen: Optional[pygame.Surface] = None
+
+
+def init_headless() -> pygame.Surface:
+    """Initialize pygame once per process with dummy video and audio."""
+    global _screen
+    if _screen is None:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+        pygame.init()
+        _screen = pygame.display.set_mode((WIDTH * SCALE, HEIGHT * SCALE))
+    return _screen
+
+
+def run_instance(config: InstanceConfig) -> InstanceStats:
+    """Play one game in this process until game over or max_frames."""
+    screen = init_headless()
+    # Imported here so assets are only touched after the display exists
+    from gamelib.mgmt.game_event import EVENT_BUS
+    from starfighter_game.scenes import MAIN_SCENE, create_scene_manager
+
+    random.seed(config.seed)
+    policy = create_policy(config, random.Random(config.seed))
+    scene = create_scene_manager(screen).enter(MAIN_SCENE)
+    dt = 1.0 / config.fps
+
+    frames = 0
+    peak_entities = 0
+    total_time = 0.0
+    max_time = 0.0
+    while frames < config.max_frames:
+        keys = policy(frames)
+        start = time.perf_counter()
+        scene.update([], keys, dt)
+        EVENT_BUS.dispatch()
+        elapsed = time.perf_counter() - start
+        total_time += elapsed
+        max_time = max(max_time, elapsed)
+        frames += 1
+        peak_entities = max(peak_entities, len(esper._entities))
+        if scene.next is not scene:
+            break
+
+    game_over = scene.player_spawner.game_over
+    if not game_over:
+        scene.on_exit()
+    return InstanceStats(
+        seed=config.seed,
+        policy=config.policy,
+        score=scene.score,
+        survival_s=frames * dt,
+        frames=frames,
+        game_over=game_over,
+        peak_entities=peak_entities,
+        mean_frame_ms=total_time / frames * 1000 if frames else 0.0,
+        max_frame_ms=max_time * 1000,
+    )
+
+
+def run_farm(
+    configs: Iterable[InstanceConfig],
+    processes: Optional[int] = None,
+    on_result: Optional[Callable[[InstanceStats], None]] = None,
+) -> FarmStats:
+    """Run the instances across a pool of worker processes.
+
+    Args:
+        configs: One config per game
+        processes: Worker count, defaults to the number of CPUs
+        on_result: Called in this process as each result arrives
+    """
+    stats = FarmStats()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes or os.cpu_count()) as pool:
+        for result in pool.map(run_instance, configs):
+            stats.instances.append(result)
+            if on_result:
+                on_result(result)
+    stats.wall_s = time.perf_counter() - start
+    return stats
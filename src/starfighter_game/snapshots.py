@@ -0,0 +1,38 @@
+import pygame
+
+from gamelib.ecs.rendering import RenderSurfaceComponent
+from gamelib.ecs.snapshot import SnapshotRegistry, default_registry
+
+from starfighter_game.assets import ASSETS
+from starfighter_game.powerup import on_speed_powerup_collided
+from starfighter_game.prefabs import PREFABS
+from starfighter_game.projectile import on_projectile_collided
+from starfighter_game.regions import REGIONS
+
+
+def create_snapshot_registry(scene) -> SnapshotRegistry:
+    """Registry for snapshots of a MainScene world.
+
+    Spawner callbacks are bound to the scene's spawners, so the registry is
+    only valid for restoring into the same scene. Effects live outside the
+    world and are not part of snapshots.
+    """
+    registry = default_registry()
+    registry.register_ref(
+        "asteroid.on_collided", scene.asteroid_spawner.on_asteroid_collided
+    )
+    registry.register_ref("projectile.on_collided", on_projectile_collided)
+    registry.register_ref("speed_powerup.on_collided", on_speed_powerup_collided)
+    registry.register_ref("player.on_collided", scene.player_spawner.on_player_collided)
+
+    for region in REGIONS:
+        registry.register_ref(f"bounds.{region.name}", region)
+    for name in ASSETS.names():
+        asset = ASSETS[name]
+        if isinstance(asset, pygame.Surface):
+            registry.register_ref(f"asset.{name}", asset)
+    for name in PREFABS.names():
+        for component in PREFABS[name].shared:
+            if isinstance(component, RenderSurfaceComponent):
+                registry.register_ref(f"prefab.{name}.surface", component.surface)
+    return registry
@@ -1,17 +1,18 @@
-from os.path import join
 from gamelib.mgmt.game_mixer import GameMixer
-import pygame
 
+from starfighter_game.assets import ASSETS
 from starfighter_game.game_events import *
 
-EXPLOSION_PATH = join("assets", "sounds", "small_explosion.wav")
-PROJECTILE_LAUNCH_PATH = join("assets", "sounds", "blipSelect_0002.wav")
+EXPLOSION_SOUND = "small_explosion"
+PROJECTILE_LAUNCH_SOUND = "blipSelect_0002"
 
 
-def init_sound() -> None:
-    mixer = GameMixer()
-    sound_explosion = pygame.mixer.Sound(EXPLOSION_PATH)
-    sound_projectile = pygame.mixer.Sound(PROJECTILE_LAUNCH_PATH)
+def init_sound(mixer: GameMixer) -> GameMixer:
+    sound_explosion = mixer.register(
+        ASSETS[EXPLOSION_SOUND], max_voices=3, cooldown_ms=30, priority=1
+    )
+    sound_projectile = mixer.register(ASSETS[PROJECTILE_LAUNCH_SOUND], max_voices=2)
     sound_projectile.set_volume(0.2)
-    ON_ASTEROID_DESTROYED.add_listener(lambda e: mixer.play_sound(sound_explosion))
+    ON_ASTEROID_DESTROYED.add_listener(lambda batch: mixer.play_sound(sound_explosion))
     ON_PROJECTILE_LAUNCHED.add_listener(lambda: mixer.play_sound(sound_projectile))
+    return mixer
@@ -1,18 +1,21 @@
-from os.path import join
 from typing import Callable, Set, Tuple
 import esper
 import pygame
 from gamelib.ecs.collision import ColliderComponent
-from gamelib.ecs.geometry import PositionComponent, RectComponent
+from gamelib.ecs.geometry import ParentComponent, PositionComponent, RectComponent
 from gamelib.ecs.rendering import RenderSurfaceComponent
 from gamelib.ecs.player import PlayerControllerComponent
 
+from starfighter_game.assets import ASSETS
+
 SCALE = 4
 P_WIDTH = 16 * SCALE
 P_HEIGHT = 16 * SCALE
 WHITE = (255, 255, 255)
 
-PLAYER_IMAGE = join("assets", "images", "player.png")
+PLAYER_SPRITE = "player"
+# Where projectiles are fired from, relative to the player's position
+MUZZLE_OFFSET = (32, 0)
 
 
 class PlayerSpawner:
@@ -20,12 +23,14 @@ class PlayerSpawner:
     def __init__(self) -> None:
         self.game_over = False
         self.player_pos = PositionComponent(-100, -100)
+        self.muzzle_pos = PositionComponent(-100, -100)
 
     def on_player_collided(self, entity: int, other_entity: int, tags: Set[str]):
         if "enemy" in tags:
             self.game_over = True
 
     def spawn(self, position: Tuple[int, int], screen: pygame.Surface) -> int:
+        self.game_over = False
         self.player_pos = PositionComponent(position[0], position[1])
         player_component = PlayerControllerComponent(
             base_speed=5,
@@ -34,9 +39,7 @@ class PlayerSpawner:
             width=P_WIDTH,
             height=P_HEIGHT,
         )
-        surface_component = RenderSurfaceComponent.from_image(PLAYER_IMAGE, True).scale(
-            SCALE
-        )
+        surface_component = RenderSurfaceComponent(ASSETS[PLAYER_SPRITE])
         rect_collider_component = ColliderComponent(
             P_WIDTH,
             P_HEIGHT,
@@ -50,4 +53,11 @@ class PlayerSpawner:
             player_component,
             rect_collider_component,
         )
+        # Follows the player via TransformProcessor
+        self.muzzle_pos = PositionComponent(
+            position[0] + MUZZLE_OFFSET[0], position[1] + MUZZLE_OFFSET[1]
+        )
+        esper.create_entity(
+            self.muzzle_pos, ParentComponent(new_player, *MUZZLE_OFFSET)
+        )
         return new_player
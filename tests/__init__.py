@@ -0,0 +1,5 @@
+import sys
+from os.path import dirname, join
+
+# Like the scripts in the repository root, run against the sources in src
+sys.path.insert(0, join(dirname(dirname(__file__)), "src"))
@@ -0,0 +1,50 @@
+import unittest
+
+import esper
+
+from gamelib.ecs.collision import ColliderComponent, CollisionProcessor
+from gamelib.ecs.geometry import MoveProcessor, VelocityComponent
+from gamelib.ecs.spawning import create_entities, with_position
+
+
+class SweptCollisionTest(unittest.TestCase):
+    def setUp(self):
+        self.world = f"test_collision_{self._testMethodName}"
+        esper.switch_world(self.world)
+        self.collisions = CollisionProcessor()
+        esper.add_processor(MoveProcessor(), priority=100)
+        esper.add_processor(self.collisions, priority=90)
+
+    def tearDown(self):
+        esper.switch_world("default")
+        esper.delete_world(self.world)
+
+    def test_spawned_projectile_hits_thin_wall_on_first_move(self):
+        # Starts right below a 2 px wall and ends above it after one move
+        (wall,) = create_entities([with_position([ColliderComponent(100, 2)], (0, 40))])
+        (projectile,) = create_entities(
+            [
+                with_position(
+                    [
+                        VelocityComponent((0, -30)),
+                        ColliderComponent(8, 8, fast=True),
+                    ],
+                    (46, 42),
+                )
+            ]
+        )
+        entered = []
+        self.collisions.on_collision(entered.append)
+
+        esper.process(1)
+
+        pair = (wall, projectile)
+        self.assertIn(pair, self.collisions.contacts)
+        self.assertIn(pair, self.collisions.impacts)
+        self.assertEqual(
+            [(event.entity_a, event.entity_b) for event in entered], [pair]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import random
+import unittest
+
+import esper
+
+from gamelib.ecs.entities import (
+    EntityAllocator,
+    destroy_entity,
+    entity_generation,
+    entity_index,
+)
+from gamelib.ecs.geometry import PositionComponent
+from gamelib.ecs.snapshot import SnapshotRegistry, restore_world, save_world
+from gamelib.ecs.worlds import clear_world, use_entity_allocator
+
+
+class EntityAllocatorTest(unittest.TestCase):
+    def setUp(self):
+        self.world = f"test_entities_{self._testMethodName}"
+        esper.switch_world(self.world)
+        self.allocator = use_entity_allocator()
+
+    def tearDown(self):
+        esper.switch_world("default")
+        esper.delete_world(self.world)
+
+    def test_churn_reuses_slots(self):
+        rng = random.Random(0)
+        live = []
+        for _ in range(20000):
+            live.append(esper.create_entity(PositionComponent(0, 0)))
+            if len(live) > 300:
+                esper.delete_entity(live.pop(rng.randrange(len(live))), immediate=True)
+
+        self.assertEqual(set(live), set(esper._entities))
+        self.assertTrue(all(self.allocator.is_current(entity) for entity in live))
+        self.assertLessEqual(self.allocator.capacity, 2 * 301)
+        self.assertGreater(self.allocator.recycled, 0)
+
+    def test_stale_handle_after_reuse(self):
+        stale = esper.create_entity(PositionComponent(0, 0))
+        esper.delete_entity(stale, immediate=True)
+        self.allocator.reclaim()
+        reused = esper.create_entity(PositionComponent(1, 1))
+
+        self.assertEqual(entity_index(reused), entity_index(stale))
+        self.assertEqual(entity_generation(reused), entity_generation(stale) + 1)
+        self.assertFalse(esper.entity_exists(stale))
+        self.assertFalse(self.allocator.is_current(stale))
+        self.assertFalse(destroy_entity(stale))
+        self.assertTrue(esper.entity_exists(reused))
+
+    def test_clear_world_keeps_allocator(self):
+        old = [esper.create_entity(PositionComponent(0, 0)) for _ in range(3)]
+        clear_world()
+
+        self.assertIs(esper._entity_count, self.allocator)
+        new = [esper.create_entity(PositionComponent(0, 0)) for _ in range(3)]
+        self.assertFalse(set(old) & set(new))
+        self.assertFalse(any(self.allocator.is_current(entity) for entity in old))
+        self.assertTrue(all(self.allocator.is_current(entity) for entity in new))
+
+    def test_restore_resyncs_allocator(self):
+        registry = SnapshotRegistry()
+        registry.register_types(PositionComponent)
+        kept = [esper.create_entity(PositionComponent(i, 0)) for i in range(5)]
+        esper.delete_entity(kept.pop(1), immediate=True)
+        data = save_world(registry)
+
+        clear_world()
+        esper.create_entity(PositionComponent(0, 0))
+        restore_world(data, registry)
+
+        self.assertIs(esper._entity_count, self.allocator)
+        self.assertTrue(all(self.allocator.is_current(entity) for entity in kept))
+        created = [esper.create_entity(PositionComponent(0, 0)) for _ in range(10)]
+        self.assertFalse(set(kept) & set(created))
+        self.assertEqual(len(esper._entities), len(kept) + len(created))
+
+    def test_rebuild_rejects_shared_slot_index(self):
+        allocator = EntityAllocator({1: {}, 1 << 16 | 1: {}})
+        with self.assertRaises(ValueError):
+            allocator.rebuild()
+
+
+if __name__ == "__main__":
+    unittest.main()
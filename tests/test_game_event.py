@@ -0,0 +1,39 @@
+import unittest
+
+from gamelib.mgmt.game_event import EventBus, GameEvent, ListenerScope
+
+
+class ListenerScopeTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = EventBus()
+        self.event = GameEvent("hit", bus=self.bus)
+        self.other = GameEvent("other", bus=self.bus)
+        self.received = []
+
+    def test_close_delivers_queued_payloads(self):
+        scope = ListenerScope()
+        self.event.add_listener(self.received.append, scope=scope)
+        self.event.trigger(1)
+        self.event.trigger(2)
+
+        scope.close()
+        self.event.trigger(3)
+        self.bus.dispatch()
+
+        self.assertEqual(self.received, [1, 2])
+        self.assertEqual(self.event.listeners, [])
+
+    def test_close_leaves_other_events_queued(self):
+        scope = ListenerScope()
+        self.event.add_listener(self.received.append, scope=scope)
+        self.other.add_listener(self.received.append)
+        self.other.trigger("other")
+
+        scope.close()
+        self.assertEqual(self.received, [])
+        self.bus.dispatch()
+        self.assertEqual(self.received, ["other"])
+
+
+if __name__ == "__main__":
+    unittest.main()
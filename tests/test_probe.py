@@ -0,0 +1,33 @@
+import unittest
+
+import esper
+
+from gamelib.ecs.geometry import PositionComponent
+from gamelib.ecs.probe import ProbeComponent, ProbeProcessor
+
+
+class ProbeComponentTest(unittest.TestCase):
+    def setUp(self):
+        self.world = f"test_probe_{self._testMethodName}"
+        esper.switch_world(self.world)
+
+    def tearDown(self):
+        esper.switch_world("default")
+        esper.delete_world(self.world)
+
+    def test_deprecated_probe_runs_every_frame(self):
+        calls = []
+        position = PositionComponent(1, 2)
+        with self.assertWarns(DeprecationWarning):
+            probe = ProbeComponent(position, lambda *args: calls.append(args))
+        entity = esper.create_entity(probe)
+        esper.add_processor(ProbeProcessor())
+
+        esper.process(0.016)
+        esper.process(0.016)
+
+        self.assertEqual(calls, [(entity, position)] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
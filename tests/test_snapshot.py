@@ -0,0 +1,118 @@
+import functools
+import unittest
+from dataclasses import dataclass
+from typing import Any
+
+import esper
+import pygame
+
+from gamelib.ecs.geometry import PositionComponent, RectComponent, VelocityComponent
+from gamelib.ecs.snapshot import (
+    SnapshotError,
+    SnapshotRegistry,
+    restore_world,
+    save_world,
+)
+
+
+def on_hit(entity: int, damage: int = 1):
+    pass
+
+
+@dataclass
+class CallbackComponent:
+    callback: Any
+    area: pygame.Rect
+    tags: set
+
+
+class SnapshotRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.world = f"test_snapshot_{self._testMethodName}"
+        esper.switch_world(self.world)
+        self.registry = SnapshotRegistry()
+        self.registry.register_types(
+            CallbackComponent, PositionComponent, RectComponent, VelocityComponent
+        )
+        self.registry.register_ref("on_hit", on_hit)
+
+    def tearDown(self):
+        esper.switch_world("default")
+        esper.delete_world(self.world)
+
+    def round_trip(self) -> dict[int, dict[type, Any]]:
+        data = save_world(self.registry)
+        esper.clear_database()
+        esper.create_entity(PositionComponent(-1, -1))
+        restore_world(data, self.registry)
+        return esper._entities
+
+    def test_components_by_value(self):
+        mover = esper.create_entity(
+            PositionComponent(3, 4), VelocityComponent((1, -2), multiplier=0.5)
+        )
+        still = esper.create_entity(PositionComponent(7, 8))
+
+        entities = self.round_trip()
+
+        self.assertEqual(set(entities), {mover, still})
+        self.assertEqual(entities[mover][PositionComponent], PositionComponent(3, 4))
+        self.assertEqual(
+            entities[mover][VelocityComponent], VelocityComponent((1, -2), 0.5)
+        )
+        self.assertEqual(entities[still], {PositionComponent: PositionComponent(7, 8)})
+        self.assertEqual(
+            sorted(entity for entity, _ in esper.get_component(PositionComponent)),
+            sorted([mover, still]),
+        )
+
+    def test_refs_and_partials(self):
+        plain = esper.create_entity(
+            CallbackComponent(on_hit, pygame.Rect(1, 2, 3, 4), {"enemy"})
+        )
+        bound = esper.create_entity(
+            CallbackComponent(
+                functools.partial(on_hit, 5), pygame.Rect(0, 0, 1, 1), set()
+            )
+        )
+
+        entities = self.round_trip()
+
+        restored = entities[plain][CallbackComponent]
+        self.assertIs(restored.callback, on_hit)
+        self.assertEqual(restored.area, pygame.Rect(1, 2, 3, 4))
+        self.assertEqual(restored.tags, {"enemy"})
+        partial = entities[bound][CallbackComponent].callback
+        self.assertIsInstance(partial, functools.partial)
+        self.assertIs(partial.func, on_hit)
+        self.assertEqual(partial.args, (5,))
+
+    def test_shared_component_stays_shared(self):
+        position = PositionComponent(10, 20)
+        entity = esper.create_entity(position, RectComponent(position, 8, 8))
+
+        entities = self.round_trip()
+
+        restored = entities[entity]
+        self.assertIs(restored[RectComponent].pos, restored[PositionComponent])
+        self.assertEqual(restored[RectComponent].rect, pygame.Rect(10, 20, 8, 8))
+
+    def test_unregistered_callable_is_rejected(self):
+        esper.create_entity(
+            CallbackComponent(lambda entity: None, pygame.Rect(0, 0, 1, 1), set())
+        )
+        with self.assertRaises(SnapshotError):
+            save_world(self.registry)
+
+    def test_partial_with_keywords_is_rejected(self):
+        esper.create_entity(
+            CallbackComponent(
+                functools.partial(on_hit, damage=2), pygame.Rect(0, 0, 1, 1), set()
+            )
+        )
+        with self.assertRaises(SnapshotError):
+            save_world(self.registry)
+
+
+if __name__ == "__main__":
+    unittest.main()